@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import shutil
+
+import build
+
+COPY_CHUNK_BYTES = 1 << 30
+COPY_THREADS = 8
+
+class SyncReport:
+    def __init__(self):
+        self.copied: list[str] = []
+        self.skipped: list[str] = []
+        self.removed: list[str] = []
+        self.bytes_copied = 0
+        self.bytes_skipped = 0
+
+def find_static_files(static_dir: str) -> dict[str, os.stat_result]:
+    files: dict[str, os.stat_result] = {}
+    for directory, _, file_names in os.walk(static_dir):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            files[os.path.relpath(path, static_dir)] = os.stat(path)
+    return dict(sorted(files.items()))
+
+def copy_file(source_path: str, output_path: str):
+    # copy_file_range keeps the data in the kernel (and lets filesystems that
+    # support it share extents). shutil.copyfile covers everything else.
+    try:
+        with open(source_path, 'rb') as source, open(output_path, 'wb') as output:
+            while os.copy_file_range(source.fileno(), output.fileno(), COPY_CHUNK_BYTES) > 0:
+                pass
+    except (AttributeError, OSError):
+        shutil.copyfile(source_path, output_path)
+    shutil.copystat(source_path, output_path)
+
+def link_or_copy_file(source_path: str, output_path: str, use_hardlinks: bool):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    if os.path.lexists(output_path):
+        os.remove(output_path)
+    if use_hardlinks:
+        try:
+            os.link(source_path, output_path)
+            return
+        except OSError:
+            pass
+    copy_file(source_path, output_path)
+
+def sync_static(static_dir: str, output_dir: str, use_hardlinks: bool=False,
+                threads: int=COPY_THREADS) -> SyncReport:
+    # Mirrors static_dir into output_dir. The build manifest keeps the size,
+    # mtime and hash of every file synced last time: a file whose size and
+    # mtime match is skipped without reading it, and one that was only
+    # touched is skipped after hashing. Files that were synced before but
+    # are gone from static_dir are removed; nothing else in output_dir is
+    # touched, so generated pages are safe.
+    report = SyncReport()
+    manifest_path = build.manifest_path_for(output_dir)
+    manifest = build.load_manifest(manifest_path)
+    previous_assets: dict[str, list] = manifest.get('assets', {})
+    assets: dict[str, list] = {}
+    to_copy: list[str] = []
+
+    for relative_path, stat in find_static_files(static_dir).items():
+        output_path = os.path.join(output_dir, relative_path)
+        previous = previous_assets.get(relative_path)
+        output_exists = os.path.isfile(output_path)
+        if previous != None and output_exists and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+            assets[relative_path] = previous
+            report.skipped.append(relative_path)
+            report.bytes_skipped += stat.st_size
+            continue
+        file_hash = build.hash_file(os.path.join(static_dir, relative_path))
+        assets[relative_path] = [stat.st_size, stat.st_mtime_ns, file_hash]
+        if previous != None and output_exists and previous[2] == file_hash:
+            report.skipped.append(relative_path)
+            report.bytes_skipped += stat.st_size
+        else:
+            to_copy.append(relative_path)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(link_or_copy_file, os.path.join(static_dir, relative_path),
+                                   os.path.join(output_dir, relative_path), use_hardlinks)
+                   for relative_path in to_copy]
+        for relative_path, future in zip(to_copy, futures):
+            future.result()
+            if relative_path + '.gz' not in assets:
+                build.remove_sidecar(os.path.join(output_dir, relative_path))
+            report.copied.append(relative_path)
+            report.bytes_copied += assets[relative_path][0]
+
+    for relative_path in sorted(previous_assets):
+        if relative_path not in assets:
+            output_path = os.path.join(output_dir, relative_path)
+            if relative_path + '.gz' not in assets:
+                build.remove_sidecar(output_path)
+            build.remove_file(output_dir, output_path)
+            report.removed.append(relative_path)
+
+    manifest = build.load_manifest(manifest_path)
+    manifest['assets'] = assets
+    build.save_manifest(manifest_path, manifest)
+    return report
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import os
+
+import build
+
+MAX_IN_FLIGHT = 64
+IO_CONCURRENCY = 16
+
+async def _render_pages(content_dir: str, output_dir: str, relative_paths: list[str], executor: Executor,
+                        max_in_flight: int, io_concurrency: int, cache_size: int, cache_dir: str|None,
+                        template_path: str|None, headings: dict[str, list[list]], links: dict[str, list[list]]):
+    # Each page's heading rows and link rows are added to headings and links
+    # as it is rendered.
+    # max_in_flight tasks each carry one page at a time from read to write,
+    # which caps how many pages are held in memory. Reads and writes run in
+    # threads, rendering in the executor, so disk and CPU overlap.
+    loop = asyncio.get_running_loop()
+    io_slots = asyncio.Semaphore(io_concurrency)
+    pending = iter(relative_paths)
+
+    async def carry_pages():
+        for relative_path in pending:
+            async with io_slots:
+                markdown = await asyncio.to_thread(build.read_source, content_dir, relative_path)
+            page, page_headings, page_links = await loop.run_in_executor(executor, build.render_source_in_worker,
+                                                                         relative_path, markdown, cache_size,
+                                                                         cache_dir, template_path)
+            headings[relative_path] = page_headings
+            links[relative_path] = page_links
+            del markdown
+            async with io_slots:
+                await asyncio.to_thread(build.write_page, output_dir, relative_path, page)
+
+    tasks = [asyncio.create_task(carry_pages()) for _ in range(min(max_in_flight, len(relative_paths)))]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def build_site_async(content_dir: str, output_dir: str, jobs: int|None=None, force: bool=False,
+                           max_in_flight: int=MAX_IN_FLIGHT, io_concurrency: int=IO_CONCURRENCY,
+                           cache_size: int=build.FRAGMENT_CACHE_ENTRIES,
+                           cache_dir: str|None=None, template_path: str|None=None) -> build.BuildResult:
+    # Same plan, output and manifest as build.build_site.
+    if jobs == None:
+        jobs = os.cpu_count() or 1
+    plan = build.plan_build(content_dir, output_dir, force, template_path)
+    for relative_path in plan.removed_paths:
+        build.remove_output(output_dir, relative_path)
+
+    # With one job, rendering still runs off the event loop thread so that
+    # reads and writes keep going while a page renders.
+    if jobs == 1:
+        executor = ThreadPoolExecutor(max_workers=1)
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+    headings: dict[str, list[list]] = {}
+    links: dict[str, list[list]] = {}
+    with executor:
+        await _render_pages(content_dir, output_dir, plan.dirty_paths, executor, max_in_flight, io_concurrency,
+                            cache_size, cache_dir, template_path, headings, links)
+
+    build.save_build_manifest(plan, headings, links)
+    return build.BuildResult(plan.dirty_paths, plan.removed_paths, {}, headings=headings, links=links)
+
+def build_site_with_asyncio(*args, **kwargs) -> build.BuildResult:
+    return asyncio.run(build_site_async(*args, **kwargs))
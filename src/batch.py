@@ -0,0 +1,56 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import render
+
+# Documents are sent to workers in chunks of at least this many characters,
+# so each round trip carries enough work to pay for the pickling.
+MIN_CHUNK_CHARS = 64 * 1024
+CHUNKS_PER_JOB = 4
+IN_FLIGHT_PER_JOB = 2
+
+def render_chunk(documents: list[str]) -> list[str]:
+    return list(render.render_many(documents))
+
+def iter_chunks(documents: Iterable[str], chunk_chars: int) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    chunk_size = 0
+    for markdown in documents:
+        chunk.append(markdown)
+        chunk_size += len(markdown)
+        if chunk_size >= chunk_chars:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        yield chunk
+
+def chunk_chars_for(documents: Iterable[str], jobs: int) -> int:
+    # With a list the total size is known up front, so chunks are sized to
+    # give each worker a few of them. A stream gets the minimum size.
+    if isinstance(documents, (list, tuple)):
+        total = sum(len(markdown) for markdown in documents)
+        return max(MIN_CHUNK_CHARS, total // (jobs * CHUNKS_PER_JOB))
+    return MIN_CHUNK_CHARS
+
+def render_many_parallel(documents: Iterable[str], jobs: int|None=None) -> Iterator[str]:
+    # Same output, in the same order, as render.render_many, with chunks
+    # rendered in worker processes. Only a few chunks per worker are in
+    # flight, so a long stream of documents is never read all at once.
+    if jobs == None:
+        jobs = os.cpu_count() or 1
+    chunks = iter_chunks(documents, chunk_chars_for(documents, jobs))
+    if jobs == 1:
+        for chunk in chunks:
+            yield from render_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(render_chunk, chunk))
+            if len(pending) >= jobs * IN_FLIGHT_PER_JOB:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
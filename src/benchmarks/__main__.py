@@ -0,0 +1,12 @@
+import sys
+
+from benchmarks import attributes, blocks, emphasis, escaping, inline, links, many, memory, suite
+
+BENCHMARKS = {'inline': inline.main, 'memory': memory.main, 'blocks': blocks.main, 'attributes': attributes.main,
+              'emphasis': emphasis.main, 'many': many.main, 'escaping': escaping.main,
+              'links': links.main}
+
+if len(sys.argv) > 1 and sys.argv[1] in BENCHMARKS:
+    BENCHMARKS[sys.argv[1]]()
+else:
+    sys.exit(suite.main())
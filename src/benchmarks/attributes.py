@@ -0,0 +1,32 @@
+import timeit
+
+import htmlnode
+from htmlnode import LeafNode, ParentNode
+
+LINK_TARGETS = [f'https://example.com/docs/page-{i}?ref=nav&lang=en' for i in range(20)]
+
+def link_heavy_page(links: int=20000) -> ParentNode:
+    items = [ParentNode('li', [LeafNode('a', f'Link {i}', {'href': LINK_TARGETS[i % len(LINK_TARGETS)],
+                                                          'target': '_blank'})])
+             for i in range(links)]
+    return ParentNode('div', [ParentNode('ul', items)])
+
+def uncached_to_html(page: ParentNode) -> str:
+    htmlnode._props_cache.clear()
+    limit = htmlnode.PROPS_CACHE_LIMIT
+    htmlnode.PROPS_CACHE_LIMIT = 0
+    try:
+        return page.to_html()
+    finally:
+        htmlnode.PROPS_CACHE_LIMIT = limit
+
+def main():
+    page = link_heavy_page()
+    assert uncached_to_html(page) == page.to_html()
+    uncached = min(timeit.repeat(lambda: uncached_to_html(page), number=1, repeat=5))
+    cached = min(timeit.repeat(page.to_html, number=1, repeat=5))
+    print(f'20000 links: uncached attributes {uncached * 1e3:.1f} ms, cached {cached * 1e3:.1f} ms, '
+          f'speedup {uncached / cached:.2f}x')
+
+if __name__ == '__main__':
+    main()
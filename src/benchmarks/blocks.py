@@ -0,0 +1,43 @@
+import io
+import timeit
+
+from blocks import *
+
+DOCUMENT_PIECE = '''# A heading
+
+A paragraph with a few words
+that continues onto a second line.
+
+- first item
+- second item
+- third item
+
+1. one
+2. two
+3. three
+
+> quoted line
+> another quoted line
+
+```
+print("code")
+```
+
+'''
+
+def two_stage(markdown: str) -> list[BlockType]:
+    return [block_to_block_type(block) for block in markdown_to_blocks(markdown)]
+
+def one_pass(markdown: str) -> list[BlockType]:
+    return [block_type for block_type, _ in iter_classified_blocks(io.StringIO(markdown))]
+
+def main():
+    markdown = DOCUMENT_PIECE * 5000
+    assert two_stage(markdown) == one_pass(markdown)
+    two_stage_time = min(timeit.repeat(lambda: two_stage(markdown), number=1, repeat=5))
+    one_pass_time = min(timeit.repeat(lambda: one_pass(markdown), number=1, repeat=5))
+    print(f'{len(markdown)} chars: two-stage {two_stage_time * 1e3:.1f} ms, '
+          f'one-pass {one_pass_time * 1e3:.1f} ms, speedup {two_stage_time / one_pass_time:.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import random
+
+# Every generated document parses under the current inline rules: delimiters
+# are always paired and never nested, and no URL contains a delimiter.
+WORDS = ['static', 'site', 'generator', 'markdown', 'render', 'block', 'inline', 'node', 'page', 'build',
+         'parse', 'quick', 'brown', 'fox', 'lazy', 'dog', 'cache', 'stream', 'output', 'template']
+
+class CorpusGenerator:
+    def __init__(self, seed: int=0):
+        self.random = random.Random(seed)
+
+    def words(self, count: int) -> str:
+        return ' '.join(self.random.choice(WORDS) for _ in range(count))
+
+    def url(self) -> str:
+        return f'https://example.com/{self.random.choice(WORDS)}/{self.random.randrange(10000)}'
+
+    def inline_fragment(self) -> str:
+        match self.random.randrange(6):
+            case 0:
+                return f'**{self.words(2)}**'
+            case 1:
+                return f'_{self.words(2)}_'
+            case 2:
+                return f'`{self.words(1)}()`'
+            case 3:
+                return f'[{self.words(2)}]({self.url()})'
+            case 4:
+                return f'![{self.words(2)}]({self.url()}.png)'
+        return self.words(3)
+
+    def dense_paragraph(self, fragments: int=40) -> str:
+        return ' '.join(self.inline_fragment() for _ in range(fragments))
+
+    def link_paragraph(self, links: int=40) -> str:
+        return ' and '.join(f'[{self.words(2)}]({self.url()})' if i % 4 else f'![{self.words(1)}]({self.url()}.jpg)'
+                            for i in range(links))
+
+    def unordered_list(self, items: int=200) -> str:
+        return '\n'.join(f'- {self.words(4)} {self.inline_fragment()}' for _ in range(items))
+
+    def ordered_list(self, items: int=200) -> str:
+        return '\n'.join(f'{i + 1}. {self.words(4)}' for i in range(items))
+
+    def code_block(self, lines: int=500) -> str:
+        return '```\n' + '\n'.join(f'    {self.words(1)} = {self.words(3)!r}' for _ in range(lines)) + '\n```'
+
+    def quote(self, lines: int=5) -> str:
+        return '\n'.join(f'> {self.words(6)}' for _ in range(lines))
+
+    def heading(self) -> str:
+        return f'{"#" * self.random.randint(1, 6)} {self.words(4)}'
+
+    def snippet(self) -> str:
+        # Around 200 characters, like a product blurb or changelog entry.
+        return f'## {self.words(3)}\n\n{self.words(8)} {self.inline_fragment()} {self.words(6)}.\n\n' \
+               f'- {self.words(3)}\n- {self.words(3)} {self.inline_fragment()}\n'
+
+    def document(self, blocks: int=200) -> str:
+        makers = [self.heading, self.dense_paragraph, self.dense_paragraph, self.link_paragraph,
+                  self.unordered_list, self.ordered_list, self.code_block, self.quote]
+        return '\n\n'.join(self.random.choice(makers)() for _ in range(blocks)) + '\n'
+
+def generate_document(seed: int=0, blocks: int=200) -> str:
+    return CorpusGenerator(seed).document(blocks)
@@ -0,0 +1,33 @@
+import timeit
+
+from htmlnode import ParentNode
+from inline import parse_inline
+from render import text_to_children
+
+# Inputs that make naive emphasis and code span matching quadratic: openers
+# that never close, closers with no opener, and backtick runs of every
+# length with no partner.
+ADVERSARIAL = {
+    'unclosed openers': lambda n: '**a _b ' * n,
+    'stray closers': lambda n: 'a** b_ ' * n,
+    'mismatched nesting': lambda n: '_a **b ' * n + 'c_ d** ' * n,
+    'deep nesting': lambda n: '**a _' * n + 'x' + '_ b**' * n,
+    'backtick runs': lambda n: ' '.join('`' * (i % 64 + 1) for i in range(n)),
+    'unclosed links': lambda n: '[a](b [c ' * n,
+}
+SIZES = [1000, 2000, 4000, 8000]
+
+def main():
+    for name, make_input in ADVERSARIAL.items():
+        timings = []
+        for size in SIZES:
+            markdown = make_input(size)
+            # The tree has to render too, however deep it is.
+            ParentNode('p', text_to_children(markdown)).to_html()
+            seconds = min(timeit.repeat(lambda: parse_inline(markdown), number=1, repeat=3))
+            timings.append((len(markdown), seconds))
+        per_char = ', '.join(f'{length} chars {seconds / length * 1e9:.0f} ns/char' for length, seconds in timings)
+        print(f'{name}: {per_char}, growth x{timings[-1][1] / timings[0][1]:.1f} for x{SIZES[-1] // SIZES[0]} input')
+
+if __name__ == '__main__':
+    main()
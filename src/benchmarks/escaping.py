@@ -0,0 +1,49 @@
+import html
+import timeit
+
+from benchmarks.corpus import generate_document
+from htmlnode import CLOSE_TAGS, OPEN_TAGS, LeafNode
+from render import markdown_to_html_node
+
+def unescaped_to_html(self) -> str:
+    # LeafNode.to_html as it was before values were escaped.
+    if self.value == None:
+        raise ValueError
+    if self.tag == None:
+        return self.value
+    if self.props:
+        return f'<{self.tag}{self.props_to_htlm()}>{self.value}</{self.tag}>'
+    return OPEN_TAGS[self.tag] + self.value + CLOSE_TAGS[self.tag]
+
+def always_escaped_to_html(self) -> str:
+    if self.value == None:
+        raise ValueError
+    value = html.escape(self.value, quote=False)
+    if self.tag == None:
+        return value
+    if self.props:
+        return f'<{self.tag}{self.props_to_htlm()}>{value}</{self.tag}>'
+    return OPEN_TAGS[self.tag] + value + CLOSE_TAGS[self.tag]
+
+def time_with(to_html, tree) -> float:
+    original = LeafNode.to_html
+    LeafNode.to_html = to_html
+    try:
+        return min(timeit.repeat(tree.to_html, number=1, repeat=7))
+    finally:
+        LeafNode.to_html = original
+
+def main():
+    document = generate_document(seed=23, blocks=400)
+    prose = markdown_to_html_node(document)
+    special = markdown_to_html_node(document.replace(' and ', ' & ').replace('fox', 'a < b'))
+    for name, tree in [('typical prose', prose), ('prose with & and <', special)]:
+        baseline = time_with(unescaped_to_html, tree)
+        fast_path = time_with(LeafNode.to_html, tree)
+        naive = time_with(always_escaped_to_html, tree)
+        print(f'{name}: unescaped {baseline * 1e3:.1f} ms, fast path {fast_path * 1e3:.1f} ms '
+              f'(+{(fast_path / baseline - 1) * 100:.1f}%), html.escape on every leaf {naive * 1e3:.1f} ms '
+              f'(+{(naive / baseline - 1) * 100:.1f}%)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import timeit
+
+from textnode import *
+
+PARAGRAPH_PIECE = 'Some plain words, then **bold words** and _italic words_ with `inline code`, ' \
+                  'a [link](https://www.boot.dev) and an ![image](https://i.imgur.com/zjjcJKZ.png). '
+
+def five_pass_text_to_textnodes(markdown: str) -> list[TextNode]:
+    nodes = [TextNode(markdown, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, '**', TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, '_', TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, '`', TextType.CODE)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_image(nodes)
+    return nodes
+
+def main():
+    for repeats in (1, 100, 1000):
+        paragraph = PARAGRAPH_PIECE * repeats
+        number = max(1, 2000 // repeats)
+        five_pass = min(timeit.repeat(lambda: five_pass_text_to_textnodes(paragraph), number=number, repeat=5))
+        single_pass = min(timeit.repeat(lambda: text_to_textnodes(paragraph), number=number, repeat=5))
+        print(f'{len(paragraph):>8} chars: five-pass {five_pass / number * 1e6:10.1f} us, '
+              f'single-pass {single_pass / number * 1e6:10.1f} us, speedup {five_pass / single_pass:.2f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import time
+
+from inline import LinkIndex
+from links import PageLinks, validate_links
+import render
+
+LINKS_PER_PAGE = 50
+
+def make_pages(pages: int) -> list[str]:
+    markdowns: list[str] = []
+    for page in range(pages):
+        lines = [f'# Page {page}', '']
+        for link in range(LINKS_PER_PAGE):
+            target = (page * 7 + link) % pages
+            lines.append(f'- see [page {target}](../section-{target % 10}/page-{target}.html#page-{target})')
+        markdowns.append('\n'.join(lines) + '\n')
+    return markdowns
+
+def render_site(markdowns: list[str], collect: bool) -> dict[str, PageLinks]:
+    index: dict[str, PageLinks] = {}
+    for page, markdown in enumerate(markdowns):
+        link_index = LinkIndex() if collect else None
+        render.markdown_to_html_node(markdown, link_index=link_index).to_html()
+        if collect:
+            index[f'section-{page % 10}/page-{page}.md'] = PageLinks([f'page-{page}'], link_index.references)
+    return index
+
+def main():
+    for pages in (1000, 2000, 4000):
+        markdowns = make_pages(pages)
+        start = time.perf_counter()
+        render_site(markdowns, False)
+        rendered = time.perf_counter() - start
+        start = time.perf_counter()
+        index = render_site(markdowns, True)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        broken = validate_links(index, set())
+        validated = time.perf_counter() - start
+        links = pages * LINKS_PER_PAGE
+        assert broken == []
+        print(f'{links} links: render {rendered * 1e3:.0f} ms, render and index {indexed * 1e3:.0f} ms '
+              f'({(indexed - rendered) / links * 1e9:.0f} ns/link more), '
+              f'validate {validated * 1e3:.0f} ms ({validated / links * 1e9:.0f} ns/link)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import os
+import time
+
+import batch
+from batch import render_many_parallel
+from benchmarks.corpus import CorpusGenerator
+from render import markdown_to_html_node, render_many
+
+DOCUMENTS = 20000
+REPEAT = 3
+# render_many must not be slower than rendering one by one; this much is
+# left for timing noise.
+NOISE = 0.05
+
+def changelog_entries(generator: CorpusGenerator, count: int) -> list[str]:
+    # Entries mix a small pool of recurring headings and items, the way
+    # release notes and product blurbs do.
+    headings = [f'## {generator.words(2)}' for _ in range(20)]
+    items = [f'- {generator.words(4)} {generator.inline_fragment()}' for _ in range(200)]
+    return ['\n\n'.join([generator.random.choice(headings), generator.words(12),
+                         '\n'.join(generator.random.choice(items) for _ in range(2))]) + '\n'
+            for _ in range(count)]
+
+def throughput(render_all, documents: list[str]) -> float:
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        render_all(documents)
+        best = min(best, time.perf_counter() - start)
+    return len(documents) / best
+
+def main():
+    generator = CorpusGenerator(21)
+    jobs = os.cpu_count() or 1
+    # Templated documents such as notices and product cards repeat whole
+    # blocks; only they give the memo something to reuse.
+    templates = [generator.snippet() for _ in range(50)]
+    for name, documents in [('unique snippets', [generator.snippet() for _ in range(DOCUMENTS)]),
+                            ('changelog entries', changelog_entries(generator, DOCUMENTS)),
+                            ('templated snippets', [templates[index % 50] for index in range(DOCUMENTS)])]:
+        expected = [markdown_to_html_node(markdown).to_html() for markdown in documents]
+        assert list(render_many(documents)) == expected
+        assert list(render_many(documents, {})) == expected
+        assert list(render_many_parallel(documents, jobs)) == expected
+        average = sum(len(markdown) for markdown in documents) // len(documents)
+        one_by_one = throughput(lambda docs: [markdown_to_html_node(markdown).to_html() for markdown in docs], documents)
+        batched = throughput(lambda docs: list(render_many(docs)), documents)
+        memoized = throughput(lambda docs: list(render_many(docs, {})), documents)
+        parallel = throughput(lambda docs: list(render_many_parallel(docs, jobs)), documents)
+        print(f'{name} ({average} chars): one by one {one_by_one:.0f} docs/s, '
+              f'render_many {batched:.0f} docs/s ({batched / one_by_one:.2f}x), '
+              f'with memo {memoized:.0f} docs/s ({memoized / one_by_one:.2f}x), '
+              f'{jobs} processes {parallel:.0f} docs/s ({parallel / one_by_one:.2f}x)')
+        assert batched >= one_by_one * (1 - NOISE), 'render_many is slower than rendering one by one'
+
+if __name__ == '__main__':
+    main()
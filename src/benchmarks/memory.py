@@ -0,0 +1,110 @@
+import gc
+import os
+import tempfile
+import tracemalloc
+
+from htmlnode import *
+from textnode import *
+from ingest import iter_mapped_lines, map_source
+import render
+from benchmarks.blocks import DOCUMENT_PIECE
+from benchmarks.inline import PARAGRAPH_PIECE
+
+NODE_COUNT = 100_000
+
+# Subclasses without __slots__ get a per-instance __dict__ again, which is
+# what every node carried before the classes were slotted.
+class DictTextNode(TextNode):
+    pass
+
+class DictLeafNode(LeafNode):
+    pass
+
+def bytes_per_node(make_node) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [make_node() for _ in range(NODE_COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del nodes
+    return (after - before) / NODE_COUNT
+
+def peak_parse_memory(paragraphs: list[str]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    node_count = 0
+    html_nodes = []
+    for paragraph in paragraphs:
+        text_nodes = text_to_textnodes(paragraph)
+        node_count += len(text_nodes)
+        html_nodes.append(ParentNode('p', [text_node_to_html_node(node) for node in text_nodes]))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return node_count, peak
+
+def peak_inline_memory(paragraphs: list[str], parse) -> int:
+    gc.collect()
+    tracemalloc.start()
+    parsed = [parse(paragraph) for paragraph in paragraphs]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del parsed
+    return peak
+
+def peak_page_memory(path: str, mode: str) -> int:
+    # tracemalloc only sees the Python heap, which is the point: mapped pages
+    # belong to the page cache. Streaming holds one block at a time plus the
+    # page's heading index, so its peak grows with the number of headings
+    # and not with the rest of the page.
+    gc.collect()
+    tracemalloc.start()
+    with open(os.devnull, 'w') as out:
+        if mode == 'mapped':
+            with map_source(path) as source:
+                write_html(render.lines_to_lazy_html_node(iter_mapped_lines(source)), out)
+        else:
+            with open(path, encoding='utf-8') as source:
+                if mode == 'streamed':
+                    write_html(render.lines_to_lazy_html_node(source), out)
+                else:
+                    out.write(render.markdown_to_html_node(source.read()).to_html())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def main():
+    text = 'shared text'
+    for name, make_node in [('TextNode', lambda: TextNode(text, TextType.BOLD)),
+                            ('TextNode with __dict__', lambda: DictTextNode(text, TextType.BOLD)),
+                            ('LeafNode', lambda: LeafNode('b', text)),
+                            ('LeafNode with __dict__', lambda: DictLeafNode('b', text))]:
+        print(f'{name:<24} {bytes_per_node(make_node):7.1f} bytes/node')
+
+    paragraphs = [PARAGRAPH_PIECE * 20 for _ in range(500)]
+    corpus_size = sum(len(paragraph) for paragraph in paragraphs)
+    node_count, peak = peak_parse_memory(paragraphs)
+    print(f'parsed {corpus_size} chars into {node_count} text nodes: peak {peak / 2**20:.1f} MiB, '
+          f'{peak / node_count:.1f} bytes per text node including HTML nodes')
+
+    # Spans cost a few more bytes per record than a short slice, so they pay
+    # off on documents with long runs of text between inline markup.
+    long_fragments = [('plain prose ' * 200 + '**bold** ') * 10 for _ in range(100)]
+    for corpus_name, corpus in [('short fragments', paragraphs), ('long fragments', long_fragments)]:
+        for name, parse in [('text_to_textnodes', text_to_textnodes), ('text_to_textspans', text_to_textspans)]:
+            print(f'{corpus_name:<16} {name:<18} peak {peak_inline_memory(corpus, parse) / 2**20:.1f} MiB')
+
+    headingless_piece = DOCUMENT_PIECE.split('\n\n', 1)[1]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'page.md')
+        for piece, headings_per_piece in [(DOCUMENT_PIECE, 1), (headingless_piece, 0)]:
+            for pieces in (1000, 4000):
+                with open(path, 'w', encoding='utf-8') as file:
+                    file.write(piece * pieces)
+                size = os.path.getsize(path)
+                peaks = ', '.join(f'{mode} peak {peak_page_memory(path, mode) / 2**20:.2f} MiB'
+                                  for mode in ('whole tree', 'streamed', 'mapped'))
+                print(f'{size / 2**20:.1f} MiB page, {pieces * headings_per_piece} headings: {peaks}')
+
+if __name__ == '__main__':
+    main()
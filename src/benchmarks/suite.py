@@ -0,0 +1,98 @@
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import blocks
+import inline
+import render
+import textnode
+from benchmarks.corpus import CorpusGenerator
+
+DEFAULT_THRESHOLD = 0.10
+
+def time_stage(function, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def run_stages(seed: int, scale: int, repeat: int) -> dict:
+    generator = CorpusGenerator(seed)
+    document = generator.document(200 * scale)
+    paragraphs = [generator.dense_paragraph() for _ in range(100 * scale)] + \
+                 [generator.link_paragraph() for _ in range(25 * scale)]
+    markdown_blocks = blocks.markdown_to_blocks(document)
+    tree = render.markdown_to_html_node(document)
+
+    def parse_inline():
+        for paragraph in paragraphs:
+            inline.parse_inline(paragraph)
+
+    def parse_textnodes():
+        for paragraph in paragraphs:
+            textnode.text_to_textnodes(paragraph)
+
+    def classify_blocks():
+        for block in markdown_blocks:
+            blocks.block_to_block_type(block)
+
+    stages = {
+        'parse_inline': (parse_inline, sum(len(paragraph) for paragraph in paragraphs)),
+        'text_to_textnodes': (parse_textnodes, sum(len(paragraph) for paragraph in paragraphs)),
+        'markdown_to_blocks': (lambda: blocks.markdown_to_blocks(document), len(document)),
+        'block_to_block_type': (classify_blocks, sum(len(block) for block in markdown_blocks)),
+        'ParentNode.to_html': (tree.to_html, len(tree.to_html())),
+    }
+    results = {}
+    for name, (function, size) in stages.items():
+        seconds = time_stage(function, repeat)
+        results[name] = {'seconds': seconds, 'chars': size, 'chars_per_second': size / seconds}
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    # Timings only compare on the same corpus, so the seed and scale must
+    # match the baseline's.
+    for setting in ('seed', 'scale'):
+        if results.get(setting) != baseline.get(setting):
+            raise ValueError(f'baseline {setting} {baseline.get(setting)} does not match {results.get(setting)}')
+    regressions = []
+    for name, stage in results['stages'].items():
+        baseline_stage = baseline.get('stages', {}).get(name)
+        if baseline_stage == None:
+            continue
+        change = stage['seconds'] / baseline_stage['seconds'] - 1
+        if change > threshold:
+            regressions.append(f'{name}: {change:+.1%} (limit {threshold:+.1%})')
+    return regressions
+
+def main(argv: list[str]|None=None) -> int:
+    parser = argparse.ArgumentParser(description='Time each stage of the markdown pipeline on a synthetic corpus.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scale', type=int, default=1, help='multiplies the corpus size')
+    parser.add_argument('--repeat', type=int, default=5, help='timings per stage; the fastest is kept')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='baseline JSON to compare against; exits 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown per stage as a fraction (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = {'python': platform.python_version(), 'seed': args.seed, 'scale': args.scale,
+               'stages': run_stages(args.seed, args.scale, args.repeat)}
+    for name, stage in results['stages'].items():
+        print(f"{name:<22} {stage['seconds'] * 1e3:9.2f} ms {stage['chars_per_second'] / 1e6:8.2f} Mchar/s")
+    if args.output != None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare != None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        try:
+            regressions = compare(results, baseline, args.threshold)
+        except ValueError as error:
+            print(f'cannot compare: {error}', file=sys.stderr)
+            return 2
+        for regression in regressions:
+            print(f'regression: {regression}', file=sys.stderr)
+        if len(regressions) > 0:
+            return 1
+    return 0
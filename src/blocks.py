@@ -1,4 +1,6 @@
 from enum import Enum
+import io
+import itertools
 import re
 
 class BlockType(Enum):
@@ -9,14 +11,103 @@ class BlockType(Enum):
     UNORDERED_LIST = 'unordered_list'
     ORDERED_LIST = 'ordered_list'
 
+def iter_markdown_blocks(lines):
+    # Takes lines that keep their '\n', e.g. an open file. An empty line is
+    # exactly a '\n\n' boundary of the old split, so only the current
+    # block's lines are ever held in memory.
+    block_lines: list[str] = []
+    for line in lines:
+        if line == '\n':
+            stripped_block = ''.join(block_lines).strip()
+            if len(stripped_block) > 0:
+                yield stripped_block
+            block_lines = []
+        else:
+            block_lines.append(line)
+    stripped_block = ''.join(block_lines).strip()
+    if len(stripped_block) > 0:
+        yield stripped_block
+
 def markdown_to_blocks(markdown: str) -> list[str]:
-    split_blocks: list[str] = markdown.split('\n\n')
-    blocks_without_extra_whitespace: list[str] = []
-    for block in split_blocks:
-        stripped_block = block.strip()
-        if len(stripped_block) > 0:
-            blocks_without_extra_whitespace.append(stripped_block)
-    return blocks_without_extra_whitespace
+    return list(iter_markdown_blocks(io.StringIO(markdown)))
+
+_HEADING_PATTERN = re.compile(r'#{1,6} ')
+
+def _block_type_from_flags(block_lines: list[str], is_quote: bool, is_unordered: bool, is_ordered: bool) -> BlockType:
+    first_line = block_lines[0]
+    if _HEADING_PATTERN.match(first_line) != None:
+        return BlockType.HEADING
+    elif first_line.startswith('```') and block_lines[-1].endswith('```') and (len(block_lines) > 1 or len(first_line) >= 6):
+        return BlockType.CODE
+    elif is_quote:
+        return BlockType.QUOTE
+    elif is_unordered:
+        return BlockType.UNORDERED_LIST
+    elif is_ordered:
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+def iter_classified_blocks(lines):
+    # Same blocks as iter_markdown_blocks, but each line is checked against
+    # the quote and list rules once, as it is collected. A line is only
+    # checked when it is known not to be the block's last line, because
+    # stripping the block may still shorten that one.
+    block_lines: list[str] = []
+    whitespace_lines: list[str] = []
+    last_line = None
+    is_quote = is_unordered = is_ordered = True
+    for line in itertools.chain(lines, ('\n',)):
+        if line == '\n':
+            if last_line == None:
+                continue
+            finished_lines = [last_line.rstrip()]
+        else:
+            if line.endswith('\n'):
+                line = line[:-1]
+            if last_line == None:
+                if not line.isspace():
+                    last_line = line.lstrip()
+                continue
+            if line.isspace():
+                whitespace_lines.append(line)
+                continue
+            finished_lines = [last_line, *whitespace_lines]
+            whitespace_lines = []
+            last_line = line
+
+        for finished_line in finished_lines:
+            is_quote = is_quote and finished_line.startswith('>')
+            is_unordered = is_unordered and finished_line.startswith('- ')
+            is_ordered = is_ordered and finished_line.startswith(f'{len(block_lines) + 1}. ')
+            block_lines.append(finished_line)
+
+        if line == '\n':
+            yield _block_type_from_flags(block_lines, is_quote, is_unordered, is_ordered), block_lines
+            block_lines = []
+            whitespace_lines = []
+            last_line = None
+            is_quote = is_unordered = is_ordered = True
+
+def iter_located_blocks(lines):
+    # iter_classified_blocks, with the 1-based source line each block starts
+    # on. Line i of a block is source line start + i, since only leading and
+    # trailing whitespace-only lines are dropped from a block.
+    start = 0
+    def count_lines():
+        nonlocal start
+        in_block = False
+        for number, line in enumerate(lines, 1):
+            if line == '\n':
+                in_block = False
+            elif not in_block and not (line[:-1] if line.endswith('\n') else line).isspace():
+                start = number
+                in_block = True
+            yield line
+    # A block is only yielded once the blank line after it has been read,
+    # and no line of the next block has been read yet.
+    for block_type, block_lines in iter_classified_blocks(count_lines()):
+        yield start, block_type, block_lines
 
 def block_to_block_type(block: str) -> BlockType:
     if re.search(r'^(#{1,6}) ', block) != None:
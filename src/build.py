@@ -0,0 +1,423 @@
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+
+from fragment_cache import FragmentCache
+import htmlnode
+from headings import Heading, HeadingIndex, headings_from_rows
+from inline import LinkIndex
+from incremental import PageDiffRenderer
+from ingest import iter_mapped_lines, map_source
+import render
+import stats
+from template import Template, load_template
+
+# Used when no template file is given.
+DEFAULT_TEMPLATE = Template('''<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link rel="stylesheet" href="/styles.css" />
+  </head>
+  <body>
+    {{ Content }}
+  </body>
+</html>
+''')
+
+# Incremental builds re-render every page when this changes.
+GENERATOR_VERSION = render.RENDERER_VERSION
+FRAGMENT_CACHE_ENTRIES = 4096
+
+# Small pages are grouped until a batch holds roughly this many bytes of
+# markdown, so each worker round trip carries a useful amount of work.
+MIN_BATCH_BYTES = 64 * 1024
+BATCHES_PER_JOB = 4
+# Sources at least this big are rendered block by block into their output.
+STREAM_MIN_BYTES = 8 * 1024 * 1024
+
+class BuildResult:
+    # headings maps each rendered page to its [level, text, slug] rows, and
+    # links to the [line, target] rows of its links and images.
+    def __init__(self, rendered: list[str], removed: list[str], cache_stats: dict[str, int],
+                 stage_stats: dict[str, dict]|None=None, headings: dict[str, list[list]]|None=None,
+                 links: dict[str, list[list]]|None=None):
+        self.rendered = rendered
+        self.removed = removed
+        self.cache_stats = cache_stats
+        self.stage_stats = stage_stats
+        self.headings = headings if headings != None else {}
+        self.links = links if links != None else {}
+
+# Each worker process keeps one fragment cache for all the batches it renders.
+_fragment_cache: FragmentCache|None = None
+
+def get_fragment_cache(max_entries: int, cache_dir: str|None) -> FragmentCache|None:
+    global _fragment_cache
+    if max_entries <= 0 and cache_dir == None:
+        return None
+    if _fragment_cache == None or _fragment_cache.max_entries != max_entries or _fragment_cache.cache_dir != cache_dir:
+        _fragment_cache = FragmentCache(render.RENDERER_VERSION, max_entries, cache_dir)
+    return _fragment_cache
+
+def find_markdown_files(content_dir: str) -> list[str]:
+    relative_paths: list[str] = []
+    for directory, directory_names, file_names in os.walk(content_dir):
+        directory_names.sort()
+        for file_name in file_names:
+            if file_name.endswith('.md'):
+                relative_paths.append(os.path.relpath(os.path.join(directory, file_name), content_dir))
+    relative_paths.sort()
+    return relative_paths
+
+def output_path_for(relative_path: str) -> str:
+    return os.path.splitext(relative_path)[0] + '.html'
+
+def get_template(template_path: str|None) -> Template:
+    if template_path == None:
+        return DEFAULT_TEMPLATE
+    return load_template(template_path)
+
+def render_page(markdown: str, default_title: str, cache: FragmentCache|None=None,
+                template: Template=DEFAULT_TEMPLATE, content: str|None=None,
+                heading_index: HeadingIndex|None=None, link_index: LinkIndex|None=None) -> str:
+    # A content passed in must have been rendered into heading_index and
+    # link_index. The title comes from the index, so the page is only split
+    # into blocks by the render.
+    if heading_index == None:
+        heading_index = HeadingIndex()
+    if content == None:
+        content = render.markdown_to_html(markdown, cache, heading_index, link_index)
+    title = heading_index.title()
+    if title == None:
+        title = default_title
+    toc = heading_index.toc_html() if 'TOC' in template.slots else ''
+    return template.render({'Title': htmlnode.escape_text(title), 'Content': content, 'TOC': toc})
+
+def read_source(content_dir: str, relative_path: str) -> str:
+    with open(os.path.join(content_dir, relative_path), encoding='utf-8') as file:
+        return file.read()
+
+def render_source(relative_path: str, markdown: str, cache: FragmentCache|None=None,
+                  template: Template=DEFAULT_TEMPLATE, diff_renderer: PageDiffRenderer|None=None,
+                  heading_index: HeadingIndex|None=None, link_index: LinkIndex|None=None) -> str:
+    if heading_index == None:
+        heading_index = HeadingIndex()
+    try:
+        content = None if diff_renderer == None else diff_renderer.render(relative_path, markdown, heading_index,
+                                                                         link_index)
+        return render_page(markdown, os.path.splitext(os.path.basename(relative_path))[0], cache, template, content,
+                           heading_index, link_index)
+    except ValueError as error:
+        raise ValueError(f'{relative_path}: {error}') from error
+
+def render_source_in_worker(relative_path: str, markdown: str, cache_size: int=FRAGMENT_CACHE_ENTRIES,
+                            cache_dir: str|None=None, template_path: str|None=None
+                            ) -> tuple[str, list[list], list[list]]:
+    # Returns the page, its heading rows and its link rows.
+    heading_index = HeadingIndex()
+    link_index = LinkIndex()
+    page = render_source(relative_path, markdown, get_fragment_cache(cache_size, cache_dir), get_template(template_path),
+                         heading_index=heading_index, link_index=link_index)
+    return page, heading_index.to_rows(), link_index.to_rows()
+
+def remove_sidecar(output_path: str):
+    # A .gz written by compress.compress_output would otherwise go on being
+    # served in place of a file that was rewritten or removed, whether or not
+    # this build compresses.
+    try:
+        os.remove(output_path + '.gz')
+    except FileNotFoundError:
+        pass
+
+def write_page(output_dir: str, relative_path: str, page: str):
+    output_path = os.path.join(output_dir, output_path_for(relative_path))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    remove_sidecar(output_path)
+    with open(output_path, 'w', encoding='utf-8', newline='') as file:
+        file.write(page)
+
+def stream_file(content_dir: str, output_dir: str, relative_path: str,
+                template: Template=DEFAULT_TEMPLATE) -> tuple[HeadingIndex, LinkIndex]:
+    # Renders a page block by block straight into the output file without
+    # holding the source, the tree or the page in memory; what is held grows
+    # only with the number of headings and links, which are returned. The
+    # source is memory-mapped and scanned twice: once to find the title, once
+    # to render. A template with a table of contents needs the headings before
+    # the content, which takes one more scan.
+    source_path = os.path.join(content_dir, relative_path)
+    output_path = os.path.join(output_dir, output_path_for(relative_path))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    remove_sidecar(output_path)
+    try:
+        with map_source(source_path) as source:
+            try:
+                title = render.extract_title_from_lines(iter_mapped_lines(source))
+            except ValueError:
+                title = os.path.splitext(os.path.basename(relative_path))[0]
+            heading_index = HeadingIndex()
+            link_index = LinkIndex()
+            toc = ''
+            if 'TOC' in template.slots:
+                toc = render.index_headings(iter_mapped_lines(source)).toc_html()
+            content = htmlnode.iter_html(render.lines_to_lazy_html_node(iter_mapped_lines(source), heading_index,
+                                                                        link_index))
+            with open(output_path, 'w', encoding='utf-8', newline='') as file:
+                template.write(file, {'Title': htmlnode.escape_text(title), 'Content': content, 'TOC': toc})
+    except ValueError as error:
+        raise ValueError(f'{relative_path}: {error}') from error
+    return heading_index, link_index
+
+def render_file(content_dir: str, output_dir: str, relative_path: str, cache: FragmentCache|None=None,
+                template: Template=DEFAULT_TEMPLATE, diff_renderer: PageDiffRenderer|None=None
+                ) -> tuple[HeadingIndex, LinkIndex]:
+    # Sources too big to comfortably hold as a string, a node tree and a page
+    # at once are streamed; they skip the fragment cache.
+    if diff_renderer == None and os.path.getsize(os.path.join(content_dir, relative_path)) >= STREAM_MIN_BYTES:
+        return stream_file(content_dir, output_dir, relative_path, template)
+    heading_index = HeadingIndex()
+    link_index = LinkIndex()
+    page = render_source(relative_path, read_source(content_dir, relative_path), cache, template, diff_renderer,
+                         heading_index, link_index)
+    write_page(output_dir, relative_path, page)
+    return heading_index, link_index
+
+def render_batch(content_dir: str, output_dir: str, relative_paths: list[str],
+                 cache_size: int=FRAGMENT_CACHE_ENTRIES, cache_dir: str|None=None,
+                 collect_stats: bool=False, template_path: str|None=None
+                 ) -> tuple[dict[str, int], dict[str, dict]|None, dict[str, list[list]], dict[str, list[list]]]:
+    # Returns the cache counters, the stage timings for this batch only if
+    # collect_stats is set, and each page's heading rows and link rows.
+    cache = get_fragment_cache(cache_size, cache_dir)
+    template = get_template(template_path)
+    before = cache.stats() if cache != None else {}
+    headings: dict[str, list[list]] = {}
+    links: dict[str, list[list]] = {}
+    if collect_stats:
+        stats.reset()
+        stats.enable()
+    try:
+        for relative_path in relative_paths:
+            heading_index, link_index = render_file(content_dir, output_dir, relative_path, cache, template)
+            headings[relative_path] = heading_index.to_rows()
+            links[relative_path] = link_index.to_rows()
+    finally:
+        if collect_stats:
+            stats.disable()
+    stage_stats = stats.snapshot() if collect_stats else None
+    if cache == None:
+        return {}, stage_stats, headings, links
+    after = cache.stats()
+    return ({name: after[name] - before[name] for name in ('hits', 'disk_hits', 'misses')}, stage_stats, headings,
+            links)
+
+def make_batches(content_dir: str, relative_paths: list[str], jobs: int) -> list[list[str]]:
+    sizes = [os.path.getsize(os.path.join(content_dir, relative_path)) for relative_path in relative_paths]
+    target_bytes = max(MIN_BATCH_BYTES, sum(sizes) // (jobs * BATCHES_PER_JOB))
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_bytes = 0
+    for relative_path, size in zip(relative_paths, sizes):
+        batch.append(relative_path)
+        batch_bytes += size
+        if batch_bytes >= target_bytes:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+    if len(batch) > 0:
+        batches.append(batch)
+    return batches
+
+def hash_file(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+def manifest_path_for(output_dir: str) -> str:
+    output_dir = os.path.abspath(output_dir)
+    return os.path.join(os.path.dirname(output_dir), f'.{os.path.basename(output_dir)}.manifest.json')
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+def save_manifest(path: str, manifest: dict):
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+def remove_file(root_dir: str, path: str):
+    # Also removes directories under root_dir that the removal left empty.
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    directory = os.path.dirname(path)
+    while os.path.abspath(directory) != os.path.abspath(root_dir):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+
+def remove_output(output_dir: str, relative_path: str):
+    output_path = os.path.join(output_dir, output_path_for(relative_path))
+    remove_sidecar(output_path)
+    remove_file(output_dir, output_path)
+
+def rebuild_pages(content_dir: str, output_dir: str, relative_paths: list[str],
+                  cache: FragmentCache|None=None, template_path: str|None=None,
+                  diff_renderer: PageDiffRenderer|None=None) -> BuildResult:
+    # Re-renders just the given pages, or removes their output if the source
+    # is gone, without hashing the rest of the site. Their manifest entries
+    # are updated so the next full build does not render them again. With a
+    # diff_renderer only the blocks that changed since its last render of a
+    # page are rendered again.
+    rendered: list[str] = []
+    removed: list[str] = []
+    page_hashes: dict[str, str|None] = {}
+    headings: dict[str, list[list]] = {}
+    links: dict[str, list[list]] = {}
+    template = get_template(template_path)
+    for relative_path in relative_paths:
+        source_path = os.path.join(content_dir, relative_path)
+        if os.path.isfile(source_path):
+            heading_index, link_index = render_file(content_dir, output_dir, relative_path, cache, template,
+                                                    diff_renderer)
+            headings[relative_path] = heading_index.to_rows()
+            links[relative_path] = link_index.to_rows()
+            page_hashes[relative_path] = hash_file(source_path)
+            rendered.append(relative_path)
+        else:
+            remove_output(output_dir, relative_path)
+            if diff_renderer != None:
+                diff_renderer.forget(relative_path)
+            page_hashes[relative_path] = None
+            removed.append(relative_path)
+
+    manifest_path = manifest_path_for(output_dir)
+    manifest = load_manifest(manifest_path)
+    if manifest.get('generator_version') == GENERATOR_VERSION and \
+            manifest.get('template_hash') == template.hash and 'pages' in manifest:
+        manifest_headings = manifest.setdefault('headings', {})
+        manifest_links = manifest.setdefault('links', {})
+        for relative_path, page_hash in page_hashes.items():
+            if page_hash == None:
+                manifest['pages'].pop(relative_path, None)
+                manifest_headings.pop(relative_path, None)
+                manifest_links.pop(relative_path, None)
+            else:
+                manifest['pages'][relative_path] = page_hash
+                manifest_headings[relative_path] = headings[relative_path]
+                manifest_links[relative_path] = links[relative_path]
+        save_manifest(manifest_path, manifest)
+    return BuildResult(rendered, removed, cache.stats() if cache != None else {}, headings=headings, links=links)
+
+class BuildPlan:
+    def __init__(self, page_hashes: dict[str, str], dirty_paths: list[str], removed_paths: list[str],
+                 manifest_path: str, template_hash: str):
+        self.page_hashes = page_hashes
+        self.dirty_paths = dirty_paths
+        self.removed_paths = removed_paths
+        self.manifest_path = manifest_path
+        self.template_hash = template_hash
+
+def plan_build(content_dir: str, output_dir: str, force: bool=False, template_path: str|None=None) -> BuildPlan:
+    # Only pages whose markdown hash changed since the last build need
+    # rendering. A different generator version or template, or force, marks
+    # everything dirty.
+    if not os.path.isdir(content_dir):
+        raise ValueError(f'Content directory {content_dir} does not exist')
+
+    relative_paths = find_markdown_files(content_dir)
+    page_hashes = {relative_path: hash_file(os.path.join(content_dir, relative_path))
+                   for relative_path in relative_paths}
+    manifest_path = manifest_path_for(output_dir)
+    manifest = load_manifest(manifest_path)
+    template_hash = get_template(template_path).hash
+    if force or manifest.get('generator_version') != GENERATOR_VERSION or manifest.get('template_hash') != template_hash:
+        previous_hashes = {}
+    else:
+        previous_hashes = manifest.get('pages', {})
+
+    removed_paths = sorted(relative_path for relative_path in manifest.get('pages', {})
+                           if relative_path not in page_hashes)
+    dirty_paths = [relative_path for relative_path in relative_paths
+                   if previous_hashes.get(relative_path) != page_hashes[relative_path]
+                   or not os.path.exists(os.path.join(output_dir, output_path_for(relative_path)))]
+    return BuildPlan(page_hashes, dirty_paths, removed_paths, manifest_path, template_hash)
+
+def save_build_manifest(plan: BuildPlan, headings: dict[str, list[list]]|None=None,
+                        links: dict[str, list[list]]|None=None):
+    # Other stages keep their own keys in the same manifest. headings and
+    # links hold the rows of the pages just rendered; every other page keeps
+    # the rows it was last rendered with, unless the generator version or
+    # template changed, since the rows may then be out of date.
+    manifest = load_manifest(plan.manifest_path)
+    if manifest.get('generator_version') == GENERATOR_VERSION and manifest.get('template_hash') == plan.template_hash:
+        previous_headings: dict[str, list] = manifest.get('headings', {})
+        previous_links: dict[str, list] = manifest.get('links', {})
+    else:
+        previous_headings = {}
+        previous_links = {}
+    if headings == None:
+        headings = {}
+    if links == None:
+        links = {}
+    manifest.update(generator_version=GENERATOR_VERSION, template_hash=plan.template_hash, pages=plan.page_hashes,
+                    headings={relative_path: headings[relative_path] if relative_path in headings
+                              else previous_headings.get(relative_path, [])
+                              for relative_path in plan.page_hashes},
+                    links={relative_path: links[relative_path] if relative_path in links
+                           else previous_links.get(relative_path, [])
+                           for relative_path in plan.page_hashes})
+    # Written by the link checker before links came from the build.
+    manifest.pop('references', None)
+    save_manifest(plan.manifest_path, manifest)
+
+def load_headings(output_dir: str) -> dict[str, list[Heading]]:
+    # Every page's headings as of the last build, keyed by markdown path, for
+    # looking up headings across pages without reading any markdown.
+    manifest = load_manifest(manifest_path_for(output_dir))
+    return {relative_path: headings_from_rows(rows) for relative_path, rows in manifest.get('headings', {}).items()}
+
+def build_site(content_dir: str, output_dir: str, jobs: int|None=None, force: bool=False,
+               cache_size: int=FRAGMENT_CACHE_ENTRIES, cache_dir: str|None=None,
+               collect_stats: bool=False, template_path: str|None=None) -> BuildResult:
+    if jobs == None:
+        jobs = os.cpu_count() or 1
+    plan = plan_build(content_dir, output_dir, force, template_path)
+    for relative_path in plan.removed_paths:
+        remove_output(output_dir, relative_path)
+
+    batches = make_batches(content_dir, plan.dirty_paths, jobs)
+    cache_stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+    if jobs == 1 or len(batches) <= 1:
+        batch_stats = [render_batch(content_dir, output_dir, batch, cache_size, cache_dir, collect_stats,
+                                    template_path)
+                       for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as executor:
+            futures = [executor.submit(render_batch, content_dir, output_dir, batch, cache_size, cache_dir,
+                                       collect_stats, template_path)
+                       for batch in batches]
+            batch_stats = [future.result() for future in futures]
+    stage_stats = {} if collect_stats else None
+    headings: dict[str, list[list]] = {}
+    links: dict[str, list[list]] = {}
+    for batch_cache_stats, batch_stage_stats, batch_headings, batch_links in batch_stats:
+        for name, count in batch_cache_stats.items():
+            cache_stats[name] += count
+        if batch_stage_stats != None:
+            stats.merge(stage_stats, batch_stage_stats)
+        headings.update(batch_headings)
+        links.update(batch_links)
+
+    save_build_manifest(plan, headings, links)
+    return BuildResult(plan.dirty_paths, plan.removed_paths, cache_stats, stage_stats, headings, links)
@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import zlib
+
+import build
+
+COMPRESS_EXTENSIONS = ('.html', '.css', '.js')
+DEFAULT_LEVEL = 9
+# A sidecar that saves less than this is not worth the extra file (and the
+# server's extra stat call) over sending the original.
+MIN_SAVINGS_BYTES = 64
+COMPRESS_THREADS = 8
+CHUNK_BYTES = 1 << 20
+# zlib's wbits for a gzip header and trailer instead of a zlib one.
+GZIP_WBITS = 31
+
+class CompressReport:
+    def __init__(self):
+        self.compressed: list[str] = []
+        self.skipped: list[str] = []
+        self.not_worth_it: list[str] = []
+        self.removed: list[str] = []
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+def find_compressible_files(output_dir: str) -> dict[str, os.stat_result]:
+    files: dict[str, os.stat_result] = {}
+    for directory, _, file_names in os.walk(output_dir):
+        for file_name in file_names:
+            if file_name.endswith(COMPRESS_EXTENSIONS):
+                path = os.path.join(directory, file_name)
+                files[os.path.relpath(path, output_dir)] = os.stat(path)
+    return dict(sorted(files.items()))
+
+def gzip_file(path: str, level: int, min_savings: int) -> int|None:
+    # Writes path + '.gz' and returns its size, or removes any old sidecar
+    # and returns None if compressing saves fewer than min_savings bytes.
+    # The sidecar is built next to its final name and renamed into place, so
+    # a server never sees a partial file.
+    sidecar_path = path + '.gz'
+    temporary_path = sidecar_path + '.tmp'
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    size = 0
+    compressed_size = 0
+    with open(path, 'rb') as source, open(temporary_path, 'wb') as output:
+        while chunk := source.read(CHUNK_BYTES):
+            size += len(chunk)
+            compressed = compressor.compress(chunk)
+            compressed_size += len(compressed)
+            output.write(compressed)
+        compressed = compressor.flush()
+        compressed_size += len(compressed)
+        output.write(compressed)
+    if size - compressed_size < min_savings:
+        os.remove(temporary_path)
+        if os.path.lexists(sidecar_path):
+            os.remove(sidecar_path)
+        return None
+    stat = os.stat(path)
+    os.utime(temporary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(temporary_path, sidecar_path)
+    return compressed_size
+
+def compress_output(output_dir: str, level: int=DEFAULT_LEVEL, min_savings: int=MIN_SAVINGS_BYTES,
+                    threads: int=COMPRESS_THREADS) -> CompressReport:
+    # Writes .gz sidecars for the HTML, CSS and JS in output_dir. The build
+    # manifest records the size, mtime and hash of each file, the settings
+    # and the sidecar size (None if it was not worth writing); a file is only
+    # compressed again when its content or the settings changed, or its
+    # sidecar went missing. Sidecars of files that are gone are removed.
+    report = CompressReport()
+    manifest_path = build.manifest_path_for(output_dir)
+    previous_files: dict[str, list] = build.load_manifest(manifest_path).get('compressed', {})
+    files: dict[str, list] = {}
+    to_compress: list[str] = []
+
+    for relative_path, stat in find_compressible_files(output_dir).items():
+        path = os.path.join(output_dir, relative_path)
+        previous = previous_files.get(relative_path)
+        settings = [level, min_savings]
+        up_to_date = previous != None and previous[3:5] == settings and \
+            (previous[5] == None or os.path.isfile(path + '.gz'))
+        if up_to_date and previous[:2] == [stat.st_size, stat.st_mtime_ns]:
+            files[relative_path] = previous
+        else:
+            file_hash = build.hash_file(path)
+            files[relative_path] = [stat.st_size, stat.st_mtime_ns, file_hash] + settings + [None]
+            if up_to_date and previous[2] == file_hash:
+                files[relative_path][5] = previous[5]
+            else:
+                to_compress.append(relative_path)
+                continue
+        report.skipped.append(relative_path)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(gzip_file, os.path.join(output_dir, relative_path), level, min_savings)
+                   for relative_path in to_compress]
+        for relative_path, future in zip(to_compress, futures):
+            compressed_size = future.result()
+            files[relative_path][5] = compressed_size
+            if compressed_size == None:
+                report.not_worth_it.append(relative_path)
+            else:
+                report.compressed.append(relative_path)
+                report.bytes_in += files[relative_path][0]
+                report.bytes_out += compressed_size
+
+    for relative_path in sorted(previous_files):
+        if relative_path not in files:
+            sidecar_path = os.path.join(output_dir, relative_path + '.gz')
+            if os.path.lexists(sidecar_path):
+                build.remove_file(output_dir, sidecar_path)
+                report.removed.append(relative_path + '.gz')
+
+    manifest = build.load_manifest(manifest_path)
+    manifest['compressed'] = files
+    build.save_manifest(manifest_path, manifest)
+    return report
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+import hashlib
+import os
+
+from blocks import BlockType
+
+class FragmentCache:
+    # Rendered block HTML keyed by a hash of (renderer version, block type,
+    # block text). The in-memory store is an LRU bounded by max_entries. If
+    # cache_dir is given, fragments are also written there so later builds
+    # and other worker processes can reuse them.
+    def __init__(self, renderer_version: str, max_entries: int=4096, cache_dir: str|None=None):
+        self.renderer_version = renderer_version
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, block_type: BlockType, lines: list[str]) -> str:
+        block_hash = hashlib.sha256(f'{self.renderer_version}\0{block_type.value}\0'.encode())
+        block_hash.update('\n'.join(lines).encode())
+        return block_hash.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key[2:] + '.html')
+
+    def _remember(self, key: str, html: str):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: str) -> str|None:
+        html = self.entries.get(key)
+        if html != None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+        if self.cache_dir != None:
+            try:
+                with open(self._disk_path(key), encoding='utf-8', newline='') as file:
+                    html = file.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self._remember(key, html)
+                self.disk_hits += 1
+                return html
+        self.misses += 1
+        return None
+
+    def put(self, key: str, html: str):
+        self._remember(key, html)
+        if self.cache_dir != None:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Other processes may be reading the same key, so write a private
+            # file and rename it into place.
+            temporary_path = f'{path}.{os.getpid()}.tmp'
+            with open(temporary_path, 'w', encoding='utf-8', newline='') as file:
+                file.write(html)
+            os.replace(temporary_path, path)
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'entries': len(self.entries)}
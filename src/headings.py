@@ -0,0 +1,102 @@
+import re
+
+import htmlnode
+import inline
+from textnode import TextType
+
+_SLUG_DROP_PATTERN = re.compile(r'[^\w\- ]')
+
+def plain_text(nodes: list[inline.InlineNode]) -> str:
+    # The text a reader sees once inline markup is rendered. Images
+    # contribute nothing.
+    parts: list[str] = []
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        if node.children != None:
+            stack.extend(reversed(node.children))
+        elif node.type != TextType.IMAGE:
+            parts.append(node.text)
+    return ''.join(parts)
+
+def slugify(text: str) -> str:
+    # GitHub's rule: lower case, drop everything but word characters, spaces
+    # and hyphens, then turn spaces into hyphens.
+    slug = _SLUG_DROP_PATTERN.sub('', text.strip().lower()).replace(' ', '-')
+    return slug if slug else 'section'
+
+def unique_slug(slug: str, seen: dict[str, int]) -> str:
+    # Repeats get -1, -2, ... appended, skipping any that are already taken.
+    if slug not in seen:
+        seen[slug] = 0
+        return slug
+    while True:
+        seen[slug] += 1
+        candidate = f'{slug}-{seen[slug]}'
+        if candidate not in seen:
+            seen[candidate] = 0
+            return candidate
+
+class Heading:
+    __slots__ = ('level', 'text', 'slug')
+
+    def __init__(self, level: int, text: str, slug: str):
+        self.level = level
+        self.text = text
+        self.slug = slug
+
+    def __eq__(self, other) -> bool:
+        return self.level == other.level and self.text == other.text and self.slug == other.slug
+
+    def __repr__(self) -> str:
+        return f'Heading({self.level}, {self.text}, {self.slug})'
+
+class HeadingIndex:
+    # A page's headings in document order, filled in by the renderer as it
+    # reaches each heading block. Slugs are unique within the page and double
+    # as the headings' id attributes.
+    def __init__(self):
+        self.headings: list[Heading] = []
+        self.seen_slugs: dict[str, int] = {}
+
+    def add(self, level: int, text: str) -> Heading:
+        heading = Heading(level, text, unique_slug(slugify(text), self.seen_slugs))
+        self.headings.append(heading)
+        return heading
+
+    def title(self) -> str|None:
+        # The first h1's text, which is what render.extract_title finds.
+        for heading in self.headings:
+            if heading.level == 1:
+                return heading.text.strip()
+        return None
+
+    def to_rows(self) -> list[list]:
+        return [[heading.level, heading.text, heading.slug] for heading in self.headings]
+
+    def toc_node(self) -> htmlnode.ParentNode|None:
+        # Nested lists of links to every heading. A heading goes under the
+        # closest earlier heading with a lower level.
+        if not self.headings:
+            return None
+        root_items: list[htmlnode.HTMLNode] = []
+        # (level, children of the heading's li, its sub-list once it has one)
+        stack: list[list] = [[0, None, root_items]]
+        for heading in self.headings:
+            while stack[-1][0] >= heading.level:
+                stack.pop()
+            parent = stack[-1]
+            if parent[2] == None:
+                parent[2] = []
+                parent[1].append(htmlnode.ParentNode('ul', parent[2]))
+            item_children: list[htmlnode.HTMLNode] = [htmlnode.LeafNode('a', heading.text, {'href': f'#{heading.slug}'})]
+            parent[2].append(htmlnode.ParentNode('li', item_children))
+            stack.append([heading.level, item_children, None])
+        return htmlnode.ParentNode('ul', root_items)
+
+    def toc_html(self) -> str:
+        node = self.toc_node()
+        return '' if node == None else node.to_html()
+
+def headings_from_rows(rows: list[list]) -> list[Heading]:
+    return [Heading(level, text, slug) for level, text, slug in rows]
@@ -1,4 +1,57 @@
+from collections.abc import Iterable
+
+
+class _TagStrings(dict):
+    # Formats and remembers the tag string the first time a tag is seen.
+    def __init__(self, template: str, tags: list[str]):
+        super().__init__((tag, template.format(tag)) for tag in tags)
+        self.template = template
+
+    def __missing__(self, tag: str) -> str:
+        tag_str = self.template.format(tag)
+        self[tag] = tag_str
+        return tag_str
+
+COMMON_TAGS = ['div', 'p', 'b', 'i', 'code', 'pre', 'a', 'img', 'blockquote', 'ul', 'ol', 'li',
+               'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'span']
+OPEN_TAGS = _TagStrings('<{}>', COMMON_TAGS)
+CLOSE_TAGS = _TagStrings('</{}>', COMMON_TAGS)
+
+# Serialized attribute strings keyed by the props' items, so the same props
+# on thousands of nodes are escaped and joined once. Keying on the contents
+# keeps this correct even if a props dict is mutated later.
+_props_cache: dict[tuple, str] = {}
+PROPS_CACHE_LIMIT = 4096
+
+# Same output as html.escape(text, quote=False) and html.escape(text). Most
+# prose contains none of these characters, and a substring check is far
+# cheaper than building a copy. When one is present, chained str.replace
+# calls beat both str.translate and a compiled re.sub by a wide margin on
+# CPython, so only the characters actually found are replaced.
+def escape_text(text: str) -> str:
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+def escape_attribute(value: str) -> str:
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if "'" in value:
+        value = value.replace("'", '&#x27;')
+    return value
+
+def serialize_props(props: dict[str, str]) -> str:
+    return ''.join([f' {property}="{escape_attribute(str(val))}"' for property, val in props.items()])
+
+
 class HTMLNode:
+    __slots__ = ('tag', 'value', 'children', 'props')
+
     def __init__(self, tag: str|None=None, value: str|None=None, children: list|None=None, props: dict[str, str]|None=None):
         self.tag = tag
         self.value = value
@@ -9,10 +62,18 @@ class HTMLNode:
         raise NotImplementedError
 
     def props_to_htlm(self):
-        props_str = ''
-        if self.props != None:
-            for property, val in self.props.items():
-                props_str += f' {property}="{val}"'
+        if not self.props:
+            return ''
+        key = tuple(self.props.items())
+        try:
+            props_str = _props_cache.get(key)
+        except TypeError:
+            return serialize_props(self.props)
+        if props_str == None:
+            if len(_props_cache) >= PROPS_CACHE_LIMIT:
+                _props_cache.clear()
+            props_str = serialize_props(self.props)
+            _props_cache[key] = props_str
 
         return props_str
 
@@ -21,6 +82,8 @@ class HTMLNode:
     
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str|None, value: str, props: dict[str, str]|None=None):
         super().__init__(tag=tag, value=value, props=props)
     
@@ -28,29 +91,72 @@ class LeafNode(HTMLNode):
         if self.value == None:
             raise ValueError
         
+        value = self.value
+        if '&' in value or '<' in value or '>' in value:
+            value = escape_text(value)
         if self.tag == None:
-            return self.value
+            return value
         
-        return f'<{self.tag}{self.props_to_htlm()}>{self.value}</{self.tag}>'
+        if self.props:
+            return f'<{self.tag}{self.props_to_htlm()}>{value}</{self.tag}>'
+        return OPEN_TAGS[self.tag] + value + CLOSE_TAGS[self.tag]
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag: str, children: list[HTMLNode], props: dict[str, str]|None=None):
         super().__init__(tag=tag, children=children, props=props)
     
     def to_html(self) -> str:
-        if self.tag == None:
-            raise ValueError('Tag must be present')
-        
-        if self.children == None:
-            raise ValueError('No children provided')
-        
-        html_str = f'<{self.tag}{self.props_to_htlm()}>'
-        for child in self.children:
-            html_str += child.to_html()
-        html_str += f'</{self.tag}>'
-        
-        return html_str       
+        return ''.join(iter_html(self))
+
+
+class LazyParentNode(ParentNode):
+    # Children are pulled from an iterable only while the node is being
+    # serialized, so with iter_html or write_html just the current child has
+    # to exist. An iterator can only be serialized once.
+    __slots__ = ()
+
+    def __init__(self, tag: str, children: Iterable[HTMLNode], props: dict[str, str]|None=None):
+        super().__init__(tag=tag, children=children, props=props)
+
+
+def iter_html(node: HTMLNode):
+    # Walks the tree with an explicit stack so deep nesting cannot hit the
+    # recursion limit. Closing tags are pushed as plain strings, and the
+    # children of lazy nodes as the iterator they are drawn from.
+    stack: list = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif not isinstance(item, HTMLNode):
+            child = next(item, None)
+            if child != None:
+                stack.append(item)
+                stack.append(child)
+        elif isinstance(item, ParentNode):
+            if item.tag == None:
+                raise ValueError('Tag must be present')
+            
+            if item.children == None:
+                raise ValueError('No children provided')
+            
+            if item.props:
+                yield f'<{item.tag}{item.props_to_htlm()}>'
+            else:
+                yield OPEN_TAGS[item.tag]
+            stack.append(CLOSE_TAGS[item.tag])
+            if isinstance(item, LazyParentNode):
+                stack.append(iter(item.children))
+            else:
+                stack.extend(reversed(item.children))
+        else:
+            yield item.to_html()
+
+def write_html(node: HTMLNode, file):
+    file.writelines(iter_html(node))
 
 
 '''
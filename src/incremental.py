@@ -0,0 +1,100 @@
+import difflib
+import io
+
+import blocks
+import render
+from blocks import BlockType
+from fragment_cache import FragmentCache
+from headings import HeadingIndex
+from inline import LinkIndex
+
+class PageDiffRenderer:
+    # Remembers each page's blocks, their rendered HTML and the links in
+    # them, counted from the block's first line. When a page is rendered
+    # again, the new block sequence is diffed against the old one and only
+    # inserted or changed blocks go through the inline parser and
+    # serializer; the rest reuse their old fragments and links.
+    def __init__(self, cache: FragmentCache|None=None):
+        self.cache = cache
+        self.pages: dict[str, tuple[list[tuple], list[str], list[list[tuple[int, str]]]]] = {}
+        self.blocks_rendered = 0
+        self.blocks_reused = 0
+
+    def _render_block(self, block: tuple) -> tuple[str, list[tuple[int, str]]]:
+        block_type, text = block
+        if block_type == BlockType.HEADING:
+            # Filled in once the whole page is known; see render().
+            return '', []
+        self.blocks_rendered += 1
+        lines = text.split('\n')
+        link_index = LinkIndex()
+        if self.cache == None:
+            return render.block_to_html_node(block_type, lines, None, link_index).to_html(), link_index.references
+        key = self.cache.key(block_type, lines)
+        html = self.cache.get(key)
+        if html == None:
+            html = render.block_to_html_node(block_type, lines, None, link_index).to_html()
+            self.cache.put(key, html)
+        else:
+            render.index_block_links(link_index, 0, block_type, lines)
+        return html, link_index.references
+
+    def render(self, page_id: str, markdown: str, heading_index: HeadingIndex|None=None,
+               link_index: LinkIndex|None=None) -> str:
+        # Block start lines are kept out of the diff, so an edit that only
+        # moves blocks up or down leaves them reused.
+        starts: list[int] = []
+        new_blocks: list[tuple] = []
+        for start, block_type, lines in blocks.iter_located_blocks(io.StringIO(markdown)):
+            starts.append(start)
+            new_blocks.append((block_type, '\n'.join(lines)))
+        old_blocks, old_fragments, old_links = self.pages.get(page_id, ([], [], []))
+
+        # Most edits touch one spot, so strip the common prefix and suffix
+        # before handing the middle to SequenceMatcher.
+        prefix = 0
+        limit = min(len(old_blocks), len(new_blocks))
+        while prefix < limit and old_blocks[prefix] == new_blocks[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_blocks[-1 - suffix] == new_blocks[-1 - suffix]:
+            suffix += 1
+
+        rendered_before = self.blocks_rendered
+        fragments = old_fragments[:prefix]
+        block_links = old_links[:prefix]
+        old_middle = old_blocks[prefix:len(old_blocks) - suffix]
+        new_middle = new_blocks[prefix:len(new_blocks) - suffix]
+        matcher = difflib.SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == 'equal':
+                fragments.extend(old_fragments[prefix + old_start:prefix + old_end])
+                block_links.extend(old_links[prefix + old_start:prefix + old_end])
+            else:
+                for block in new_middle[new_start:new_end]:
+                    html, links = self._render_block(block)
+                    fragments.append(html)
+                    block_links.append(links)
+        fragments.extend(old_fragments[len(old_fragments) - suffix:])
+        block_links.extend(old_links[len(old_links) - suffix:])
+        # A heading's id depends on every heading before it, so headings are
+        # always rendered, in order, into the page's index.
+        if heading_index == None:
+            heading_index = HeadingIndex()
+        for index, (block_type, text) in enumerate(new_blocks):
+            if block_type == BlockType.HEADING:
+                self.blocks_rendered += 1
+                heading_links = LinkIndex()
+                fragments[index] = render.block_to_html_node(block_type, text.split('\n'), heading_index,
+                                                             heading_links).to_html()
+                block_links[index] = heading_links.references
+        self.blocks_reused += len(new_blocks) - (self.blocks_rendered - rendered_before)
+        if link_index != None:
+            for start, links in zip(starts, block_links):
+                link_index.references.extend((start + line, target) for line, target in links)
+
+        self.pages[page_id] = (new_blocks, fragments, block_links)
+        return '<div>' + ''.join(fragments) + '</div>'
+
+    def forget(self, page_id: str):
+        self.pages.pop(page_id, None)
@@ -0,0 +1,35 @@
+from collections.abc import Iterator
+import contextlib
+import mmap
+import re
+
+# The line endings a text-mode file translates to '\n'.
+_NEWLINE_PATTERN = re.compile(rb'\r\n|\r|\n')
+
+@contextlib.contextmanager
+def map_source(path: str):
+    # The file's bytes as a read-only buffer backed by the page cache rather
+    # than the Python heap. Empty files cannot be mapped and get b''.
+    with open(path, 'rb') as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        with buffer:
+            yield buffer
+
+def iter_mapped_lines(buffer) -> Iterator[str]:
+    # Yields the same lines as iterating over the file in text mode with
+    # encoding='utf-8', but the newlines are found on the raw bytes and only
+    # one line is decoded at a time. Blank lines are never decoded at all.
+    start = 0
+    for match in _NEWLINE_PATTERN.finditer(buffer):
+        end = match.start()
+        if end == start:
+            yield '\n'
+        else:
+            yield str(buffer[start:end], 'utf-8') + '\n'
+        start = match.end()
+    if start < len(buffer):
+        yield str(buffer[start:], 'utf-8')
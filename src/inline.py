@@ -0,0 +1,259 @@
+import bisect
+import re
+import string
+import unicodedata
+
+import htmlnode
+from textnode import TextType
+
+class InlineNode:
+    # A node of the inline tree. Bold and italic nodes hold children; text,
+    # code, link and image nodes hold text (and a url for links and images).
+    __slots__ = ('type', 'text', 'url', 'children')
+
+    def __init__(self, text_type: TextType, text: str='', url: str|None=None, children: list|None=None):
+        self.type = text_type
+        self.text = text
+        self.url = url
+        self.children = children
+
+    def __eq__(self, other) -> bool:
+        # Compared with an explicit stack, since emphasis can nest to any
+        # depth.
+        pairs = [(self, other)]
+        while pairs:
+            node, other_node = pairs.pop()
+            if not isinstance(other_node, InlineNode) or node.type != other_node.type or \
+                    node.text != other_node.text or node.url != other_node.url:
+                return False
+            if node.children == None or other_node.children == None:
+                if node.children is not other_node.children:
+                    return False
+            elif len(node.children) != len(other_node.children):
+                return False
+            else:
+                pairs.extend(zip(node.children, other_node.children))
+        return True
+
+    def __repr__(self) -> str:
+        if self.children != None:
+            return f'InlineNode({self.type.value}, {self.children})'
+        return f'InlineNode({self.type.value}, {self.text!r}, {self.url})'
+
+_TOKEN_PATTERN = re.compile(r'(`+)'
+                            r'|!\[([^\[\]]+)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)'
+                            r'|\[([^\[\]]+)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)'
+                            r'|(\*\*+|_+)')
+_BACKTICK_RUN_PATTERN = re.compile(r'`+')
+_PUNCTUATION = frozenset(string.punctuation)
+
+# Characters a delimiter run uses up per match, and what the match makes.
+_EMPHASIS = {'*': (2, TextType.BOLD), '_': (1, TextType.ITALIC)}
+
+def _is_punctuation(char: str) -> bool:
+    if char.isascii():
+        return char in _PUNCTUATION
+    return unicodedata.category(char)[0] in 'PS'
+
+def _flanking(markdown: str, start: int, end: int) -> tuple[bool, bool]:
+    # CommonMark's left- and right-flanking rules. The ends of the text count
+    # as whitespace.
+    before = markdown[start - 1] if start > 0 else ' '
+    after = markdown[end] if end < len(markdown) else ' '
+    left = not after.isspace() and (not _is_punctuation(after) or before.isspace() or _is_punctuation(before))
+    right = not before.isspace() and (not _is_punctuation(before) or after.isspace() or _is_punctuation(after))
+    return left, right
+
+class _Delimiter:
+    __slots__ = ('char', 'node', 'index')
+
+    def __init__(self, char: str, node: InlineNode, index: int):
+        self.char = char
+        self.node = node
+        self.index = index
+
+def _find_code_closers(markdown: str) -> dict[int, list[int]]:
+    # Backtick runs by length, each list reversed so the next candidate
+    # closer is at the end. Code spans pop from these as the scan moves
+    # forward, so finding every closer is linear overall.
+    runs: dict[int, list[int]] = {}
+    for match in _BACKTICK_RUN_PATTERN.finditer(markdown):
+        runs.setdefault(match.end() - match.start(), []).append(match.start())
+    for starts in runs.values():
+        starts.reverse()
+    return runs
+
+def _append_text(nodes: list[InlineNode], text: str):
+    if text:
+        nodes.append(InlineNode(TextType.TEXT, text))
+
+def _close_emphasis(nodes: list[InlineNode], stack: list[_Delimiter], bottoms: dict[str, int],
+                    char: str, count: int) -> int:
+    # Matches a closing run against openers on the stack, innermost first,
+    # and returns how many of its characters were not used.
+    size, text_type = _EMPHASIS[char]
+    while count >= size:
+        position = len(stack) - 1
+        while position >= bottoms[char] and (stack[position].char != char or len(stack[position].node.text) < size):
+            position -= 1
+        if position < bottoms[char]:
+            # Nothing below here can ever open this kind of run again.
+            bottoms[char] = len(stack)
+            break
+        opener = stack[position]
+        # Openers between this one and the closer can no longer be closed;
+        # they stay in the tree as literal text.
+        del stack[position + 1:]
+        opener.node.text = opener.node.text[:-size]
+        element = InlineNode(text_type, children=nodes[opener.index + 1:])
+        if opener.node.text:
+            nodes[opener.index + 1:] = [element]
+        else:
+            nodes[opener.index:] = [element]
+            stack.pop()
+        for other in bottoms:
+            bottoms[other] = min(bottoms[other], len(stack))
+        count -= size
+    return count
+
+def parse_inline(markdown: str, links: list[tuple[int, str]]|None=None) -> list[InlineNode]:
+    # One left-to-right scan with a stack of open delimiter runs, resolving
+    # nested bold, italic and code spans in linear time. Runs that never
+    # close are kept as literal text. If links is given, the (offset, url)
+    # of every link and image is appended to it.
+    nodes: list[InlineNode] = []
+    stack: list[_Delimiter] = []
+    bottoms = {char: 0 for char in _EMPHASIS}
+    code_closers = None
+    position = 0
+    while True:
+        match = _TOKEN_PATTERN.search(markdown, position)
+        if match == None:
+            _append_text(nodes, markdown[position:])
+            break
+        _append_text(nodes, markdown[position:match.start()])
+        position = match.end()
+        if match.group(1) is not None:
+            if code_closers == None:
+                code_closers = _find_code_closers(markdown)
+            closers = code_closers[len(match.group(1))]
+            while closers and closers[-1] < position:
+                closers.pop()
+            if closers:
+                closer = closers.pop()
+                nodes.append(InlineNode(TextType.CODE, markdown[position:closer]))
+                position = closer + len(match.group(1))
+            else:
+                _append_text(nodes, match.group(1))
+        elif match.group(2) is not None:
+            nodes.append(InlineNode(TextType.IMAGE, match.group(2), match.group(3)))
+            if links != None:
+                links.append((match.start(), match.group(3)))
+        elif match.group(4) is not None:
+            nodes.append(InlineNode(TextType.LINK, match.group(4), match.group(5)))
+            if links != None:
+                links.append((match.start(), match.group(5)))
+        else:
+            run = match.group(6)
+            char = run[0]
+            left, right = _flanking(markdown, match.start(), match.end())
+            if char == '_':
+                can_open = left and (not right or _is_punctuation(markdown[match.start() - 1]))
+                can_close = right and (not left or _is_punctuation(markdown[match.end()]))
+            else:
+                can_open, can_close = left, right
+            count = len(run)
+            if can_close:
+                count = _close_emphasis(nodes, stack, bottoms, char, count)
+            if count:
+                node = InlineNode(TextType.TEXT, run[:count])
+                nodes.append(node)
+                if can_open:
+                    stack.append(_Delimiter(char, node, len(nodes) - 1))
+    return nodes
+
+class LinkIndex:
+    # The (line, target) of every link and image on a page, gathered while
+    # its inline text is parsed.
+    __slots__ = ('references',)
+
+    def __init__(self):
+        self.references: list[tuple[int, str]] = []
+
+    def add(self, first_line: int, parts: list[str], found: list[tuple[int, str]]):
+        # found holds (offset, target) pairs in ' '.join(parts), where part i
+        # comes from line first_line + i.
+        if len(parts) == 1:
+            self.references.extend((first_line, target) for _, target in found)
+            return
+        line_starts: list[int] = []
+        offset = 0
+        for part in parts:
+            line_starts.append(offset)
+            offset += len(part) + 1
+        for offset, target in found:
+            self.references.append((first_line + bisect.bisect_right(line_starts, offset) - 1, target))
+
+    def to_rows(self) -> list[list]:
+        return [[line, target] for line, target in self.references]
+
+_LINK_SCAN_PATTERN = re.compile(r'(`+)'
+                                r'|!\[([^\[\]]+)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)'
+                                r'|\[([^\[\]]+)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)')
+
+def iter_link_targets(markdown: str):
+    # Yields (offset, TextType.LINK or TextType.IMAGE, url) for every link and
+    # image parse_inline would produce, skipping code spans the same way.
+    # Emphasis never changes what is a link, so it is not tracked.
+    code_closers = None
+    position = 0
+    while True:
+        match = _LINK_SCAN_PATTERN.search(markdown, position)
+        if match == None:
+            return
+        position = match.end()
+        if match.group(1) is not None:
+            if code_closers == None:
+                code_closers = _find_code_closers(markdown)
+            closers = code_closers[len(match.group(1))]
+            while closers and closers[-1] < position:
+                closers.pop()
+            if closers:
+                position = closers.pop() + len(match.group(1))
+        elif match.group(2) is not None:
+            yield match.start(), TextType.IMAGE, match.group(3)
+        else:
+            yield match.start(), TextType.LINK, match.group(5)
+
+_EMPHASIS_TAGS = {TextType.BOLD: 'b', TextType.ITALIC: 'i'}
+
+def inline_node_to_html_node(node: InlineNode) -> htmlnode.HTMLNode:
+    # Bold and italic nest to any depth, so the tree is converted with an
+    # explicit stack: each parent is created with an empty child list that
+    # is filled in when its turn comes.
+    if node.children == None:
+        return _leaf_to_html_node(node)
+    root = htmlnode.ParentNode(_EMPHASIS_TAGS[node.type], [])
+    stack = [(node.children, root.children)]
+    while stack:
+        children, html_children = stack.pop()
+        for child in children:
+            if child.children == None:
+                html_children.append(_leaf_to_html_node(child))
+            else:
+                parent = htmlnode.ParentNode(_EMPHASIS_TAGS[child.type], [])
+                html_children.append(parent)
+                stack.append((child.children, parent.children))
+    return root
+
+def _leaf_to_html_node(node: InlineNode) -> htmlnode.HTMLNode:
+    match node.type:
+        case TextType.TEXT:
+            return htmlnode.LeafNode(tag=None, value=node.text)
+        case TextType.CODE:
+            return htmlnode.LeafNode(tag='code', value=node.text)
+        case TextType.LINK:
+            return htmlnode.LeafNode(tag='a', value=node.text, props={'href': node.url})
+        case TextType.IMAGE:
+            return htmlnode.LeafNode(tag='img', value='', props={'src': node.url, 'alt': node.text})
+    raise ValueError('Invalid InlineNode specifications')
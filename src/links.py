@@ -0,0 +1,89 @@
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+import build
+
+class PageLinks:
+    # What one page contributes to the site's link index: the anchors its
+    # headings get and the (line, target) of every link and image on it.
+    __slots__ = ('anchors', 'references')
+
+    def __init__(self, anchors: list[str], references: list[tuple[int, str]]):
+        self.anchors = anchors
+        self.references = references
+
+class BrokenLink:
+    __slots__ = ('page', 'line', 'target', 'reason')
+
+    def __init__(self, page: str, line: int, target: str, reason: str):
+        self.page = page
+        self.line = line
+        self.target = target
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f'{self.page}:{self.line}: {self.target} ({self.reason})'
+
+def index_site(output_dir: str) -> dict[str, PageLinks]:
+    # Every page in the build manifest, keyed by its markdown path. Anchors
+    # and references are the heading slugs and links the build recorded
+    # while rendering, so no markdown is read.
+    manifest = build.load_manifest(build.manifest_path_for(output_dir))
+    page_headings: dict[str, list] = manifest.get('headings', {})
+    page_links: dict[str, list] = manifest.get('links', {})
+    return {relative_path: PageLinks([slug for _, _, slug in page_headings.get(relative_path, [])],
+                                     [(line, target) for line, target in page_links.get(relative_path, [])])
+            for relative_path in manifest.get('pages', {})}
+
+def find_output_files(output_dir: str) -> set[str]:
+    files: set[str] = set()
+    for directory, _, file_names in os.walk(output_dir):
+        relative_dir = os.path.relpath(directory, output_dir)
+        for file_name in file_names:
+            files.add(posixpath.normpath(posixpath.join(relative_dir.replace(os.sep, '/'), file_name)))
+    return files
+
+def resolve_target(page_path: str, target: str) -> tuple[str, str]|None:
+    # The output path and fragment an internal target points at, relative to
+    # the output root, or None if the target is external. page_path is the
+    # linking page's output path.
+    parts = urlsplit(target)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    if path == '':
+        path = page_path
+    elif path.startswith('/'):
+        path = posixpath.normpath(path.lstrip('/') or '.')
+    else:
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(page_path), path))
+    if path == '.' or parts.path.endswith('/'):
+        path = posixpath.normpath(posixpath.join(path, 'index.html'))
+    return path, unquote(parts.fragment)
+
+def validate_links(index: dict[str, PageLinks], output_files: set[str]) -> list[BrokenLink]:
+    # Every reference is checked once against a set of files and a set of
+    # anchors per page, so the whole site takes time linear in its links.
+    anchors = {build.output_path_for(relative_path).replace(os.sep, '/'): set(page_links.anchors)
+               for relative_path, page_links in index.items()}
+    broken: list[BrokenLink] = []
+    for relative_path, page_links in index.items():
+        page_path = build.output_path_for(relative_path).replace(os.sep, '/')
+        for line, target in page_links.references:
+            resolved = resolve_target(page_path, target)
+            if resolved == None:
+                continue
+            path, fragment = resolved
+            if path not in output_files and path not in anchors:
+                index_path = posixpath.join(path, 'index.html')
+                if index_path not in output_files and index_path not in anchors:
+                    broken.append(BrokenLink(relative_path, line, target, 'no such file'))
+                    continue
+                path = index_path
+            if fragment and path in anchors and fragment not in anchors[path]:
+                broken.append(BrokenLink(relative_path, line, target, 'no such heading'))
+    return broken
+
+def check_site(output_dir: str) -> list[BrokenLink]:
+    return validate_links(index_site(output_dir), find_output_files(output_dir))
@@ -1,11 +1,118 @@
-import textnode
-import htmlnode
+import argparse
+import json
+import os
+import sys
 
-def main():
-    my_node = textnode.TextNode('This is some anchor text', textnode.TextType.LINK, 'https://www.boot.dev')
-    print(my_node)
-    my_node_2 = htmlnode.HTMLNode('mouse', 'house', 'louse', {'blouse': 'grouse', 'moose': 'shoes'})
-    print(my_node_2.props_to_htlm())
+import assets
+import async_build
+import build
+import compress
+import links
+import stats
+import watch
+
+DEFAULT_TEMPLATE_PATH = 'template.html'
+
+def parse_args(argv: list[str]|None=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Render a directory of markdown pages into a static site.')
+    parser.add_argument('command', nargs='?', default='build', choices=['build', 'watch'],
+                        help='build once, or build then rebuild on changes and serve the output (default: build)')
+    parser.add_argument('--content', default='content', help='directory of markdown pages (default: content)')
+    parser.add_argument('--output', default='public', help='directory to write pages into (default: public)')
+    parser.add_argument('--template', help='page template with {{ Title }} and {{ Content }} slots and an '
+                        'optional {{ TOC }} (default: template.html if it exists, else a built-in page)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='number of worker processes (default: all cores)')
+    parser.add_argument('--force', action='store_true', help='re-render every page, ignoring the build manifest')
+    parser.add_argument('--cache-dir', help='directory for rendered block fragments shared across builds')
+    parser.add_argument('--cache-size', type=int, default=build.FRAGMENT_CACHE_ENTRIES,
+                        help='fragments kept in memory per worker, 0 to disable (default: %(default)s)')
+    parser.add_argument('--stats', nargs='?', const='table', choices=['table', 'json'],
+                        help='report per-stage call counts, time and output size (default format: table)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='overlap file reads and writes with rendering using asyncio')
+    parser.add_argument('--max-in-flight', type=int, default=async_build.MAX_IN_FLIGHT,
+                        help='--async: pages held in memory at once (default: %(default)s)')
+    parser.add_argument('--static', default='static',
+                        help='directory of static files mirrored into the output, if it exists (default: %(default)s)')
+    parser.add_argument('--hardlink-static', action='store_true',
+                        help='hardlink static files into the output instead of copying them when possible')
+    parser.add_argument('--gzip', action='store_true',
+                        help='write precompressed .gz sidecars for the HTML, CSS and JS in the output')
+    parser.add_argument('--gzip-level', type=int, default=compress.DEFAULT_LEVEL,
+                        help='--gzip: zlib compression level from 1 to 9 (default: %(default)s)')
+    parser.add_argument('--gzip-min-savings', type=int, default=compress.MIN_SAVINGS_BYTES,
+                        help='--gzip: skip sidecars that save fewer bytes than this (default: %(default)s)')
+    parser.add_argument('--check-links', action='store_true',
+                        help='report links and images that point at missing pages, files or headings, '
+                             'and fail if there are any')
+    parser.add_argument('--host', default='127.0.0.1', help='watch: address to serve on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=8000, help='watch: port to serve on (default: %(default)s)')
+    parser.add_argument('--poll', action='store_true', help='watch: poll modification times instead of using inotify')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.template == None:
+        if os.path.isfile(DEFAULT_TEMPLATE_PATH):
+            args.template = DEFAULT_TEMPLATE_PATH
+    elif not os.path.isfile(args.template):
+        parser.error(f'template {args.template} does not exist')
+    if not 1 <= args.gzip_level <= 9:
+        parser.error('--gzip-level must be between 1 and 9')
+    if args.max_in_flight < 1:
+        parser.error('--max-in-flight must be at least 1')
+    if args.use_async and args.stats != None:
+        parser.error('--stats is not supported with --async')
+    return args
+
+def main(argv: list[str]|None=None):
+    args = parse_args(argv)
+    try:
+        if args.command == 'watch':
+            watch.watch(args.content, args.output, args.static, args.host, args.port, args.jobs, args.poll,
+                        args.template)
+            return 0
+        if args.use_async:
+            result = async_build.build_site_with_asyncio(args.content, args.output, args.jobs, args.force,
+                                                         args.max_in_flight, cache_size=args.cache_size,
+                                                         cache_dir=args.cache_dir, template_path=args.template)
+        else:
+            result = build.build_site(args.content, args.output, args.jobs, args.force, args.cache_size,
+                                      args.cache_dir, args.stats != None, args.template)
+        sync_report = None
+        if os.path.isdir(args.static):
+            sync_report = assets.sync_static(args.static, args.output, args.hardlink_static)
+        compress_report = None
+        if args.gzip:
+            compress_report = compress.compress_output(args.output, args.gzip_level, args.gzip_min_savings)
+        broken_links = links.check_site(args.output) if args.check_links else []
+    except ValueError as error:
+        print(f'error: {error}', file=sys.stderr)
+        return 1
+    print(f'Rendered {len(result.rendered)} pages into {args.output}, removed {len(result.removed)}')
+    if sync_report != None:
+        print(f'Static files: {len(sync_report.copied)} copied ({sync_report.bytes_copied} bytes), '
+              f'{len(sync_report.skipped)} unchanged ({sync_report.bytes_skipped} bytes), '
+              f'{len(sync_report.removed)} removed')
+    if compress_report != None:
+        print(f'Compressed {len(compress_report.compressed)} files ({compress_report.bytes_in} -> '
+              f'{compress_report.bytes_out} bytes), {len(compress_report.skipped)} unchanged, '
+              f'{len(compress_report.not_worth_it)} not worth compressing, {len(compress_report.removed)} sidecars removed')
+    cache_stats = result.cache_stats
+    if sum(cache_stats.values()) > 0:
+        print(f"Fragment cache: {cache_stats['hits']} hits, {cache_stats['disk_hits']} disk hits, "
+              f"{cache_stats['misses']} misses")
+    if args.stats == 'table':
+        print(stats.format_table(result.stage_stats))
+    elif args.stats == 'json':
+        print(json.dumps(result.stage_stats, indent=2))
+    for broken_link in broken_links:
+        print(f'{os.path.join(args.content, broken_link.page)}:{broken_link.line}: broken link '
+              f'{broken_link.target} ({broken_link.reason})', file=sys.stderr)
+    if broken_links:
+        print(f'{len(broken_links)} broken links', file=sys.stderr)
+        return 1
+    return 0
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,213 @@
+from collections.abc import Iterable, Iterator
+import io
+
+import blocks
+import headings
+import htmlnode
+import inline
+from blocks import BlockType
+from fragment_cache import FragmentCache
+from headings import HeadingIndex
+from inline import LinkIndex
+
+# Bump whenever a change here or in the inline parser changes the HTML that
+# is produced. Build manifests and fragment caches are keyed on it.
+RENDERER_VERSION = '5'
+# Bounds on a render_many memo: entries, and the size of a fragment worth
+# keeping, so it holds at most about 16M characters of HTML.
+RENDER_MANY_MEMO_ENTRIES = 4096
+RENDER_MANY_MEMO_FRAGMENT_CHARS = 4096
+
+def text_to_children(text: str) -> list[htmlnode.HTMLNode]:
+    return [inline.inline_node_to_html_node(node) for node in inline.parse_inline(text)]
+
+def heading_level(line: str) -> int:
+    return len(line) - len(line.lstrip('#'))
+
+def inline_texts(block_type: BlockType, lines: list[str]) -> Iterator[tuple[int, list[str]]]:
+    # Yields (index of the first line, parts) for each piece of inline text
+    # in a block, where the text that is parsed is ' '.join(parts) and part i
+    # comes from line first + i.
+    match block_type:
+        case BlockType.HEADING:
+            yield 0, [lines[0][heading_level(lines[0]) + 1:]] + lines[1:]
+        case BlockType.QUOTE:
+            yield 0, [line.lstrip('>').strip() for line in lines]
+        case BlockType.UNORDERED_LIST:
+            for index, line in enumerate(lines):
+                yield index, [line[2:]]
+        case BlockType.ORDERED_LIST:
+            for index, line in enumerate(lines):
+                yield index, [line.split('. ', 1)[1]]
+        case BlockType.PARAGRAPH:
+            yield 0, lines
+
+def _parse_indexed(text: str, link_index: LinkIndex, first_line: int,
+                   parts: list[str]|None=None) -> list[inline.InlineNode]:
+    # text is ' '.join(parts); a text without parts is one line.
+    found: list[tuple[int, str]] = []
+    nodes = inline.parse_inline(text, found)
+    if found:
+        link_index.add(first_line, parts if parts != None else [text], found)
+    return nodes
+
+def _inline_children(text: str, link_index: LinkIndex|None, first_line: int,
+                     parts: list[str]|None=None) -> list[htmlnode.HTMLNode]:
+    if link_index == None:
+        return text_to_children(text)
+    return [inline.inline_node_to_html_node(node) for node in _parse_indexed(text, link_index, first_line, parts)]
+
+def index_block_links(link_index: LinkIndex, start_line: int, block_type: BlockType, lines: list[str]):
+    # For a block whose HTML is reused rather than parsed: its links are
+    # found with a scan that skips code spans but not emphasis.
+    for first, parts in inline_texts(block_type, lines):
+        found = [(offset, url) for offset, _, url in inline.iter_link_targets(' '.join(parts))]
+        if found:
+            link_index.add(start_line + first, parts, found)
+
+def block_to_html_node(block_type: BlockType, lines: list[str], heading_index: HeadingIndex|None=None,
+                       link_index: LinkIndex|None=None, start_line: int=0) -> htmlnode.ParentNode:
+    # Links and images found while parsing are added to link_index, with
+    # lines counted from start_line, the line the block starts on.
+    match block_type:
+        case BlockType.HEADING:
+            level = heading_level(lines[0])
+            text = ' '.join(lines)[level + 1:]
+            if link_index == None:
+                nodes = inline.parse_inline(text)
+            else:
+                nodes = _parse_indexed(text, link_index, start_line, [lines[0][level + 1:]] + lines[1:])
+            children = [inline.inline_node_to_html_node(node) for node in nodes]
+            if heading_index == None:
+                return htmlnode.ParentNode(f'h{level}', children)
+            # The heading is recorded from the tree that is rendered, so the
+            # index costs no second parse.
+            heading = heading_index.add(level, headings.plain_text(nodes))
+            return htmlnode.ParentNode(f'h{level}', children, {'id': heading.slug})
+        case BlockType.CODE:
+            block = '\n'.join(lines)
+            if len(lines) > 1:
+                # The rest of the opening fence line is an info string, not code.
+                code = block[len(lines[0]) + 1:-3]
+            else:
+                code = block[3:-3]
+            return htmlnode.ParentNode('pre', [htmlnode.LeafNode('code', code)])
+        case BlockType.QUOTE:
+            parts = [line.lstrip('>').strip() for line in lines]
+            return htmlnode.ParentNode('blockquote', _inline_children(' '.join(parts), link_index, start_line, parts))
+        case BlockType.UNORDERED_LIST:
+            items = [htmlnode.ParentNode('li', _inline_children(line[2:], link_index, start_line + index))
+                     for index, line in enumerate(lines)]
+            return htmlnode.ParentNode('ul', items)
+        case BlockType.ORDERED_LIST:
+            items = [htmlnode.ParentNode('li', _inline_children(line.split('. ', 1)[1], link_index, start_line + index))
+                     for index, line in enumerate(lines)]
+            return htmlnode.ParentNode('ol', items)
+        case BlockType.PARAGRAPH:
+            return htmlnode.ParentNode('p', _inline_children(' '.join(lines), link_index, start_line, lines))
+    raise ValueError('Invalid block type')
+
+def markdown_to_html_node(markdown: str, heading_index: HeadingIndex|None=None,
+                          link_index: LinkIndex|None=None) -> htmlnode.ParentNode:
+    # Headings get ids from heading_index, which is filled in as they are
+    # reached; a fresh index is used if none is passed. Links go into
+    # link_index, if given.
+    if heading_index == None:
+        heading_index = HeadingIndex()
+    # Start lines are only counted when links are being indexed.
+    if link_index == None:
+        children = [block_to_html_node(block_type, lines, heading_index)
+                    for block_type, lines in blocks.iter_classified_blocks(io.StringIO(markdown))]
+    else:
+        children = [block_to_html_node(block_type, lines, heading_index, link_index, start)
+                    for start, block_type, lines in blocks.iter_located_blocks(io.StringIO(markdown))]
+    return htmlnode.ParentNode('div', children)
+
+def lines_to_lazy_html_node(lines: Iterable[str], heading_index: HeadingIndex|None=None,
+                            link_index: LinkIndex|None=None) -> htmlnode.LazyParentNode:
+    # Blocks are split, parsed and built one at a time as the node is
+    # serialized, so only the block being written is held in memory, plus
+    # heading_index: unique ids need every earlier slug, so memory grows
+    # with the number of headings. heading_index and link_index are complete
+    # once the node has been written out.
+    if heading_index == None:
+        heading_index = HeadingIndex()
+    if link_index == None:
+        return htmlnode.LazyParentNode('div', (block_to_html_node(block_type, block_lines, heading_index)
+                                               for block_type, block_lines in blocks.iter_classified_blocks(lines)))
+    return htmlnode.LazyParentNode('div', (block_to_html_node(block_type, block_lines, heading_index, link_index, start)
+                                           for start, block_type, block_lines in blocks.iter_located_blocks(lines)))
+
+def markdown_to_html(markdown: str, cache: FragmentCache|None=None, heading_index: HeadingIndex|None=None,
+                     link_index: LinkIndex|None=None) -> str:
+    # Same output as markdown_to_html_node(markdown).to_html(), but block
+    # fragments can come from a cache instead of being rendered again.
+    # Headings are always rendered, since their ids depend on the headings
+    # before them.
+    if cache == None:
+        return markdown_to_html_node(markdown, heading_index, link_index).to_html()
+    if heading_index == None:
+        heading_index = HeadingIndex()
+    fragments = ['<div>']
+    for start, block_type, lines in blocks.iter_located_blocks(io.StringIO(markdown)):
+        if block_type == BlockType.HEADING:
+            fragments.append(block_to_html_node(block_type, lines, heading_index, link_index, start).to_html())
+            continue
+        key = cache.key(block_type, lines)
+        html = cache.get(key)
+        if html == None:
+            html = block_to_html_node(block_type, lines, None, link_index, start).to_html()
+            cache.put(key, html)
+        elif link_index != None:
+            index_block_links(link_index, start, block_type, lines)
+        fragments.append(html)
+    fragments.append('</div>')
+    return ''.join(fragments)
+
+def render_many(documents: Iterable[str], memo: dict[tuple, str]|None=None) -> Iterator[str]:
+    # Yields markdown_to_html_node(document).to_html() for each document.
+    # With a memo, rendered blocks are kept in it, keyed by type and lines
+    # without hashing, and reused by later documents (or later calls). That
+    # only pays off when documents repeat blocks, so by default there is none.
+    for markdown in documents:
+        if memo == None:
+            yield markdown_to_html_node(markdown).to_html()
+            continue
+        heading_index = HeadingIndex()
+        fragments = ['<div>']
+        for block_type, lines in blocks.iter_classified_blocks(io.StringIO(markdown)):
+            if block_type == BlockType.HEADING:
+                fragments.append(block_to_html_node(block_type, lines, heading_index).to_html())
+                continue
+            key = (block_type, *lines)
+            html = memo.get(key)
+            if html == None:
+                html = block_to_html_node(block_type, lines).to_html()
+                if len(html) <= RENDER_MANY_MEMO_FRAGMENT_CHARS:
+                    if len(memo) >= RENDER_MANY_MEMO_ENTRIES:
+                        memo.clear()
+                    memo[key] = html
+            fragments.append(html)
+        fragments.append('</div>')
+        yield ''.join(fragments)
+
+def index_headings(lines: Iterable[str]) -> HeadingIndex:
+    # The index a render of lines would fill in, for when it is needed
+    # before the page is rendered.
+    heading_index = HeadingIndex()
+    for block_type, block_lines in blocks.iter_classified_blocks(lines):
+        if block_type == BlockType.HEADING:
+            level = heading_level(block_lines[0])
+            heading_index.add(level, headings.plain_text(inline.parse_inline(' '.join(block_lines)[level + 1:])))
+    return heading_index
+
+def extract_title_from_lines(lines: Iterable[str]) -> str:
+    # The first h1 as plain text, without its inline markup. It is not
+    # escaped.
+    for block_type, block_lines in blocks.iter_classified_blocks(lines):
+        if block_type == BlockType.HEADING and heading_level(block_lines[0]) == 1:
+            return headings.plain_text(inline.parse_inline(' '.join(block_lines)[2:].strip()))
+    raise ValueError('No h1 heading found')
+
+def extract_title(markdown: str) -> str:
+    return extract_title_from_lines(io.StringIO(markdown))
@@ -0,0 +1,121 @@
+import functools
+import time
+
+import blocks
+import htmlnode
+import inline
+
+class StageStats:
+    __slots__ = ('calls', 'seconds', 'produced', 'active')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.produced = 0
+        self.active = False
+
+# (owner, attribute, stage name, unit of what the stage produces). Stages are
+# measured by swapping these attributes for timed wrappers, so nothing is
+# measured, and nothing costs anything, until enable() is called. Callers
+# must look the functions up through their module for this to work.
+STAGES = [
+    (blocks, 'markdown_to_blocks', 'markdown_to_blocks', 'blocks'),
+    (blocks, 'iter_classified_blocks', 'iter_classified_blocks', 'blocks'),
+    (blocks, 'block_to_block_type', 'block_to_block_type', 'blocks'),
+    (inline, 'parse_inline', 'parse_inline', 'nodes'),
+    (inline, 'inline_node_to_html_node', 'inline_node_to_html_node', 'nodes'),
+    (htmlnode.ParentNode, 'to_html', 'to_html', 'chars'),
+]
+
+_stages: dict[str, StageStats] = {name: StageStats() for _, _, name, _ in STAGES}
+_originals: dict[str, object] = {}
+
+def _count_one(result) -> int:
+    return 1
+
+def _measure(stage: StageStats, function, count):
+    # A stage that calls itself through its module is only measured at the
+    # outermost call, so the time of inner calls is not counted again.
+    @functools.wraps(function)
+    def measured(*args, **kwargs):
+        if stage.active:
+            return function(*args, **kwargs)
+        stage.active = True
+        try:
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            stage.seconds += time.perf_counter() - start
+        finally:
+            stage.active = False
+        stage.calls += 1
+        stage.produced += count(result)
+        return result
+    return measured
+
+def _measure_generator(stage: StageStats, function):
+    # Only time spent producing items counts, not time the caller spends
+    # between them.
+    @functools.wraps(function)
+    def measured(*args, **kwargs):
+        stage.calls += 1
+        iterator = function(*args, **kwargs)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stage.seconds += time.perf_counter() - start
+                return
+            stage.seconds += time.perf_counter() - start
+            stage.produced += 1
+            yield item
+    return measured
+
+def is_enabled() -> bool:
+    return len(_originals) > 0
+
+def enable():
+    if is_enabled():
+        return
+    for owner, attribute, name, _ in STAGES:
+        function = getattr(owner, attribute)
+        _originals[name] = function
+        stage = _stages[name]
+        if name == 'iter_classified_blocks':
+            setattr(owner, attribute, _measure_generator(stage, function))
+        elif name in ('block_to_block_type', 'inline_node_to_html_node'):
+            setattr(owner, attribute, _measure(stage, function, _count_one))
+        else:
+            setattr(owner, attribute, _measure(stage, function, len))
+
+def disable():
+    for owner, attribute, name, _ in STAGES:
+        if name in _originals:
+            setattr(owner, attribute, _originals.pop(name))
+
+def reset():
+    for stage in _stages.values():
+        stage.calls = 0
+        stage.seconds = 0.0
+        stage.produced = 0
+        stage.active = False
+
+def snapshot() -> dict[str, dict]:
+    return {name: {'calls': _stages[name].calls, 'seconds': _stages[name].seconds,
+                   'produced': _stages[name].produced, 'unit': unit}
+            for _, _, name, unit in STAGES}
+
+def merge(total: dict[str, dict], other: dict[str, dict]) -> dict[str, dict]:
+    for name, stage in other.items():
+        if name not in total:
+            total[name] = dict(stage)
+        else:
+            for field in ('calls', 'seconds', 'produced'):
+                total[name][field] += stage[field]
+    return total
+
+def format_table(stage_stats: dict[str, dict]) -> str:
+    lines = [f'{"stage":<24}{"calls":>10}{"seconds":>11}{"produced":>12}']
+    for name, stage in stage_stats.items():
+        lines.append(f"{name:<24}{stage['calls']:>10}{stage['seconds']:>11.4f}{stage['produced']:>12} {stage['unit']}")
+    return '\n'.join(lines)
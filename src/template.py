@@ -0,0 +1,58 @@
+from collections.abc import Iterable
+import hashlib
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+class Template:
+    # Parsed once into alternating literal and slot segments:
+    # literals[0], slots[0], literals[1], ..., slots[-1], literals[-1].
+    # Rendering fills the slots and joins once, so the page is never copied
+    # once per placeholder the way chained str.replace calls would.
+    def __init__(self, source: str):
+        self.literals: list[str] = []
+        self.slots: list[str] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.literals.append(source[position:match.start()])
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.literals.append(source[position:])
+        self.hash = hashlib.sha256(source.encode()).hexdigest()
+
+    def iter_segments(self, values: dict[str, str|Iterable[str]]):
+        # A value may also be an iterable of strings, which is written out
+        # piece by piece; it can only be used for one slot.
+        yield self.literals[0]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            try:
+                value = values[slot]
+            except KeyError:
+                raise ValueError(f'No value for template slot {slot}') from None
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+            yield literal
+
+    def render(self, values: dict[str, str]) -> str:
+        return ''.join(self.iter_segments(values))
+
+    def write(self, file, values: dict[str, str|Iterable[str]]):
+        file.writelines(self.iter_segments(values))
+
+# Parsed templates by path, with the (mtime, size) they were parsed at.
+_templates: dict[str, tuple[tuple[int, int], Template]] = {}
+
+def load_template(path: str) -> Template:
+    # Re-parses the file only when its mtime or size changed.
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _templates.get(path)
+    if cached != None and cached[0] == signature:
+        return cached[1]
+    with open(path, encoding='utf-8') as file:
+        template = Template(file.read())
+    _templates[path] = (signature, template)
+    return template
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from assets import *
+from build import build_site, load_manifest, manifest_path_for
+
+
+def write_file(path: str, contents: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(contents)
+
+def read_file(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+class TestSyncStatic(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.directory.name, 'static')
+        self.output = os.path.join(self.directory.name, 'public')
+        write_file(os.path.join(self.static, 'styles.css'), 'body {}')
+        write_file(os.path.join(self.static, 'images', 'logo.svg'), '<svg></svg>')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_copies_then_skips_unchanged_files(self):
+        report = sync_static(self.static, self.output)
+        self.assertEqual(sorted(report.copied), ['images/logo.svg', 'styles.css'])
+        self.assertEqual(report.bytes_copied, len('body {}') + len('<svg></svg>'))
+        self.assertEqual(read_file(os.path.join(self.output, 'images', 'logo.svg')), '<svg></svg>')
+
+        report = sync_static(self.static, self.output)
+        self.assertEqual((report.copied, len(report.skipped)), ([], 2))
+        self.assertEqual(report.bytes_skipped, len('body {}') + len('<svg></svg>'))
+
+    def test_touched_file_is_skipped_by_hash(self):
+        sync_static(self.static, self.output)
+        os.utime(os.path.join(self.static, 'styles.css'), ns=(0, 0))
+        report = sync_static(self.static, self.output)
+        self.assertEqual(report.copied, [])
+        self.assertEqual(sync_static(self.static, self.output).skipped, ['images/logo.svg', 'styles.css'])
+
+    def test_changed_and_missing_outputs_are_copied(self):
+        sync_static(self.static, self.output)
+        write_file(os.path.join(self.static, 'styles.css'), 'body { color: red; }')
+        os.remove(os.path.join(self.output, 'images', 'logo.svg'))
+        report = sync_static(self.static, self.output)
+        self.assertEqual(sorted(report.copied), ['images/logo.svg', 'styles.css'])
+        self.assertEqual(read_file(os.path.join(self.output, 'styles.css')), 'body { color: red; }')
+
+    def test_removes_stale_files_but_not_pages(self):
+        content = os.path.join(self.directory.name, 'content')
+        write_file(os.path.join(content, 'index.md'), '# Home\n')
+        build_site(content, self.output, jobs=1)
+        sync_static(self.static, self.output)
+        os.remove(os.path.join(self.static, 'images', 'logo.svg'))
+        report = sync_static(self.static, self.output)
+        self.assertEqual(report.removed, ['images/logo.svg'])
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'images')))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'index.html')))
+        manifest = load_manifest(manifest_path_for(self.output))
+        self.assertEqual(list(manifest['assets']), ['styles.css'])
+        self.assertEqual(list(manifest['pages']), ['index.md'])
+
+    def test_build_keeps_asset_state(self):
+        content = os.path.join(self.directory.name, 'content')
+        write_file(os.path.join(content, 'index.md'), '# Home\n')
+        sync_static(self.static, self.output)
+        build_site(content, self.output, jobs=1)
+        self.assertEqual(len(load_manifest(manifest_path_for(self.output))['assets']), 2)
+
+    def test_hardlinks(self):
+        sync_static(self.static, self.output, use_hardlinks=True)
+        source = os.stat(os.path.join(self.static, 'styles.css'))
+        output = os.stat(os.path.join(self.output, 'styles.css'))
+        self.assertEqual((source.st_dev, source.st_ino), (output.st_dev, output.st_ino))
+
+
+if __name__ == '__main__':
+    unittest.main()
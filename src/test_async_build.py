@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from async_build import *
+from build import build_site, load_headings
+from test_build import read_tree, write_file
+
+
+class TestBuildSiteAsync(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.directory.name, 'content')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nWelcome **home**.\n')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# A post\n\n- with\n- a list\n')
+        for i in range(30):
+            write_file(os.path.join(self.content, 'snippets', f'{i:02}.md'), f'Snippet _{i}_\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_sequential_build(self):
+        sequential = os.path.join(self.directory.name, 'sequential')
+        expected = build_site(self.content, sequential, jobs=1)
+        for jobs in (1, 2):
+            output = os.path.join(self.directory.name, f'async-{jobs}')
+            result = build_site_with_asyncio(self.content, output, jobs, max_in_flight=4, io_concurrency=2)
+            self.assertEqual(len(result.rendered), 32)
+            self.assertEqual(read_tree(output), read_tree(sequential))
+            self.assertEqual(result.headings, expected.headings)
+            self.assertEqual(load_headings(output), load_headings(sequential))
+
+    def test_incremental_and_removals(self):
+        output = os.path.join(self.directory.name, 'public')
+        build_site_with_asyncio(self.content, output, 1)
+        write_file(os.path.join(self.content, 'index.md'), '# Changed\n')
+        os.remove(os.path.join(self.content, 'blog', 'post.md'))
+        result = build_site_with_asyncio(self.content, output, 1)
+        self.assertEqual((result.rendered, result.removed), (['index.md'], ['blog/post.md']))
+        self.assertEqual(build_site(self.content, output, jobs=1).rendered, [])
+
+    def test_render_errors_propagate(self):
+        template = os.path.join(self.directory.name, 'template.html')
+        write_file(template, '{{ Title }}{{ Missing }}')
+        with self.assertRaisesRegex(ValueError, r'\.md: No value for template slot Missing'):
+            build_site_with_asyncio(self.content, os.path.join(self.directory.name, 'public'), 1,
+                                    template_path=template)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+import render
+from batch import *
+from blocks import BlockType
+from benchmarks.corpus import CorpusGenerator
+
+
+class TestRenderMany(unittest.TestCase):
+    def setUp(self):
+        generator = CorpusGenerator(5)
+        self.documents = [generator.snippet() for _ in range(200)] + ['', '# Same\n\nblock\n', '# Same\n\nblock\n']
+        self.expected = [render.markdown_to_html_node(markdown).to_html() for markdown in self.documents]
+
+    def test_matches_rendering_one_by_one(self):
+        self.assertEqual(list(render.render_many(self.documents)), self.expected)
+
+    def test_memo_is_shared_across_documents(self):
+        memo = {}
+        self.assertEqual(list(render.render_many(self.documents, memo)), self.expected)
+        memo.clear()
+        list(render.render_many(['# Same\n\nblock\n', 'block\n\n# Same\n'], memo))
+        # Headings are not memoized, since their ids depend on the page.
+        self.assertEqual(list(memo), [(BlockType.PARAGRAPH, 'block')])
+
+    def test_parallel_keeps_order(self):
+        for jobs in (1, 2):
+            self.assertEqual(list(render_many_parallel(self.documents, jobs)), self.expected)
+            self.assertEqual(list(render_many_parallel(iter(self.documents), jobs)), self.expected)
+
+    def test_chunks_by_size(self):
+        self.assertEqual(list(iter_chunks(['aa', 'b', 'ccc', 'd'], 3)), [['aa', 'b'], ['ccc'], ['d']])
+        self.assertEqual(chunk_chars_for(iter(['x']), 4), MIN_CHUNK_CHARS)
+        self.assertEqual(chunk_chars_for(['x' * MIN_CHUNK_CHARS * 16], 2), MIN_CHUNK_CHARS * 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from benchmarks.corpus import generate_document
+from benchmarks.suite import compare
+from render import markdown_to_html_node
+
+
+class TestCorpus(unittest.TestCase):
+    def test_is_deterministic(self):
+        self.assertEqual(generate_document(seed=3, blocks=50), generate_document(seed=3, blocks=50))
+        self.assertNotEqual(generate_document(seed=3, blocks=50), generate_document(seed=4, blocks=50))
+
+    def test_renders_without_errors(self):
+        for seed in range(5):
+            markdown_to_html_node(generate_document(seed=seed, blocks=50)).to_html()
+
+class TestCompare(unittest.TestCase):
+    def test_flags_stages_over_threshold(self):
+        baseline = {'seed': 0, 'scale': 1, 'stages': {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0}}}
+        results = {'seed': 0, 'scale': 1,
+                   'stages': {'a': {'seconds': 1.05}, 'b': {'seconds': 1.5}, 'new': {'seconds': 9.0}}}
+        regressions = compare(results, baseline, 0.10)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('b:'))
+
+    def test_refuses_a_different_corpus(self):
+        baseline = {'seed': 0, 'scale': 2, 'stages': {'a': {'seconds': 2.0}}}
+        results = {'seed': 0, 'scale': 1, 'stages': {'a': {'seconds': 1.0}}}
+        self.assertRaisesRegex(ValueError, 'scale', lambda: compare(results, baseline, 0.10))
+
+
+if __name__ == '__main__':
+    unittest.main()
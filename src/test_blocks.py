@@ -1,3 +1,6 @@
+import io
+import os
+import tempfile
 import unittest
 
 from blocks import *
@@ -82,6 +85,28 @@ This is the same paragraph on a new line
             ],
         )
 
+class TestIterMarkdownBlocks(unittest.TestCase):
+    def test_reads_blocks_from_file(self):
+        md = "# Heading\n\n\n  Paragraph line one\nline two  \n\n- a\n- b"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'page.md')
+            with open(path, 'w') as file:
+                file.write(md)
+            with open(path) as file:
+                blocks = list(iter_markdown_blocks(file))
+        self.assertEqual(blocks, ["# Heading", "Paragraph line one\nline two", "- a\n- b"])
+        self.assertEqual(blocks, markdown_to_blocks(md))
+
+    def test_yields_lazily(self):
+        def lines():
+            yield 'first block\n'
+            yield '\n'
+            raise AssertionError('read past the first block')
+        self.assertEqual(next(iter_markdown_blocks(lines())), 'first block')
+
+    def test_whitespace_only_line_does_not_split(self):
+        self.assertEqual(markdown_to_blocks('a\n   \nb\n\n \n\nc'), ['a\n   \nb', 'c'])
+
 class TestBlockToBlockType(unittest.TestCase):
     def test_heading(self):
         block0 = ' Header??? '
@@ -144,6 +169,35 @@ class TestBlockToBlockType(unittest.TestCase):
         self.assertEqual(block_to_block_type(not_all_nums), BlockType.PARAGRAPH)
 
 
+class TestIterClassifiedBlocks(unittest.TestCase):
+    def test_agrees_with_block_to_block_type(self):
+        blocks = [' Header??? ', '# Heading 1', '####### Unfortunately not a header, 7', '####4:(',
+                  '```print("Jello World!")\n```', '``````', '`````',
+                  '> My name is mouse. \n> I live in 123 house. \n> Bye!', '>I am also a quote',
+                  '- This has multiple\n- It has this 2nd element', '- list\n- ',
+                  '- This looks like its a lis\nBut this line lacks a dash\n- So it is not',
+                  '1. Milk\n2. Cheese \n3. Please?', '2. Cookie \n3. I forgot #1', '1. Tomato Juice\n3. Oh dearie me.']
+        for block in blocks:
+            [(block_type, lines)] = iter_classified_blocks(io.StringIO(block))
+            self.assertEqual(block_type, block_to_block_type(block.strip()))
+            self.assertEqual('\n'.join(lines), block.strip())
+
+    def test_splits_like_markdown_to_blocks(self):
+        md = "  \n# Title\n\n\n  para one\n  \npara two  \n \n\n- a\n- b\n\n1. x\n2. y\n"
+        classified = list(iter_classified_blocks(io.StringIO(md)))
+        self.assertEqual(['\n'.join(lines) for _, lines in classified], markdown_to_blocks(md))
+        self.assertEqual([block_type for block_type, _ in classified],
+                         [BlockType.HEADING, BlockType.PARAGRAPH, BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST])
+
+class TestIterLocatedBlocks(unittest.TestCase):
+    def test_start_lines(self):
+        md = "\n  \n# Title\n\npara\n  \nmore\n   \n\n- a\n- b\n\n\nlast"
+        located = list(iter_located_blocks(io.StringIO(md)))
+        self.assertEqual([(start, lines) for start, _, lines in located],
+                         [(3, ['# Title']), (5, ['para', '  ', 'more']), (10, ['- a', '- b']), (14, ['last'])])
+        self.assertEqual([block[1:] for block in located], list(iter_classified_blocks(io.StringIO(md))))
+
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+import tempfile
+import unittest
+
+import build
+from build import *
+import stats
+
+
+def write_file(path: str, contents: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(contents)
+
+def read_tree(directory: str) -> dict[str, bytes]:
+    tree = {}
+    for parent, _, file_names in os.walk(directory):
+        for file_name in file_names:
+            path = os.path.join(parent, file_name)
+            with open(path, 'rb') as file:
+                tree[os.path.relpath(path, directory)] = file.read()
+    return tree
+
+
+class TestBuildSite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.directory.name, 'content')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nWelcome **home**.\n')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# A post\n\n- with\n- a list\n')
+        write_file(os.path.join(self.content, 'notes.txt'), 'not markdown')
+        for i in range(20):
+            write_file(os.path.join(self.content, 'snippets', f'{i:02}.md'), f'Snippet _{i}_\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_renders_every_markdown_file(self):
+        output = os.path.join(self.directory.name, 'public')
+        result = build_site(self.content, output, jobs=1)
+        self.assertEqual(len(result.rendered), 22)
+        with open(os.path.join(output, 'blog', 'post.html')) as file:
+            page = file.read()
+        self.assertIn('<title>A post</title>', page)
+        self.assertIn('<div><h1 id="a-post">A post</h1><ul><li>with</li><li>a list</li></ul></div>', page)
+        self.assertFalse(os.path.exists(os.path.join(output, 'notes.html')))
+
+    def test_output_is_identical_for_any_job_count(self):
+        for i in range(4):
+            write_file(os.path.join(self.content, 'long', f'{i}.md'), f'# Long {i}\n\n' + 'Some **bold** words.\n\n' * 4000)
+        self.assertGreater(len(make_batches(self.content, find_markdown_files(self.content), 3)), 1)
+        trees = []
+        for jobs in (1, 3):
+            output = os.path.join(self.directory.name, f'public-{jobs}')
+            build_site(self.content, output, jobs=jobs)
+            trees.append(read_tree(output))
+        self.assertEqual(trees[0], trees[1])
+
+    def test_collects_stage_stats_from_workers(self):
+        for jobs in (1, 2):
+            output = os.path.join(self.directory.name, f'stats-{jobs}')
+            result = build_site(self.content, output, jobs=jobs, cache_size=0, collect_stats=True)
+            self.assertEqual(result.stage_stats['parse_inline']['calls'], 25)
+        self.assertEqual(build_site(self.content, os.path.join(self.directory.name, 'plain'), jobs=1).stage_stats, None)
+
+    def test_page_without_h1_uses_file_name_as_title(self):
+        output = os.path.join(self.directory.name, 'public')
+        build_site(self.content, output, jobs=1)
+        with open(os.path.join(output, 'snippets', '03.html')) as file:
+            self.assertIn('<title>03</title>', file.read())
+
+    def test_title_is_escaped(self):
+        write_file(os.path.join(self.content, 'index.md'), '# Tom & <Jerry> **bold**\n')
+        stream_min_bytes = build.STREAM_MIN_BYTES
+        for min_bytes, name in [(stream_min_bytes, 'public'), (0, 'streamed')]:
+            output = os.path.join(self.directory.name, name)
+            build.STREAM_MIN_BYTES = min_bytes
+            try:
+                build_site(self.content, output, jobs=1)
+            finally:
+                build.STREAM_MIN_BYTES = stream_min_bytes
+            with open(os.path.join(output, 'index.html')) as file:
+                self.assertIn('<title>Tom &amp; &lt;Jerry&gt; bold</title>', file.read())
+
+    def test_large_sources_are_streamed_with_identical_output(self):
+        write_file(os.path.join(self.content, 'untitled.md'), 'Just _text_\n')
+        write_file(os.path.join(self.content, 'crlf.md'), '# Windows\r\n\r\nline one\r\nline two\r\n')
+        write_file(os.path.join(self.content, 'empty.md'), '')
+        template_path = os.path.join(self.directory.name, 'template.html')
+        write_file(template_path, '<nav>{{ TOC }}</nav>{{ Content }}')
+        streamed = os.path.join(self.directory.name, 'streamed')
+        stream_min_bytes = build.STREAM_MIN_BYTES
+        build.STREAM_MIN_BYTES = 0
+        try:
+            streamed_result = build_site(self.content, streamed, jobs=1, template_path=template_path)
+        finally:
+            build.STREAM_MIN_BYTES = stream_min_bytes
+        output = os.path.join(self.directory.name, 'public')
+        result = build_site(self.content, output, jobs=1, template_path=template_path)
+        self.assertEqual(read_tree(streamed), read_tree(output))
+        self.assertEqual(streamed_result.headings, result.headings)
+
+    def test_headings_are_recorded_for_each_page(self):
+        template_path = os.path.join(self.directory.name, 'template.html')
+        write_file(template_path, '<nav>{{ TOC }}</nav>{{ Content }}')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\n## Intro\n\n## Intro\n')
+        output = os.path.join(self.directory.name, 'public')
+        result = build_site(self.content, output, jobs=2, template_path=template_path)
+        self.assertEqual(result.headings['index.md'], [[1, 'Home', 'home'], [2, 'Intro', 'intro'], [2, 'Intro', 'intro-1']])
+        self.assertEqual(result.headings['snippets/03.md'], [])
+        with open(os.path.join(output, 'index.html')) as file:
+            self.assertEqual(file.read(), '<nav><ul><li><a href="#home">Home</a><ul><li><a href="#intro">Intro</a></li>'
+                                          '<li><a href="#intro-1">Intro</a></li></ul></li></ul></nav>'
+                                          '<div><h1 id="home">Home</h1><h2 id="intro">Intro</h2><h2 id="intro-1">Intro</h2></div>')
+
+        # An incremental build keeps the headings of pages it did not render.
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# A new post\n')
+        self.assertEqual(build_site(self.content, output, jobs=1, template_path=template_path).rendered, ['blog/post.md'])
+        headings = load_headings(output)
+        self.assertEqual(headings['blog/post.md'], [Heading(1, 'A new post', 'a-new-post')])
+        self.assertEqual([heading.slug for heading in headings['index.md']], ['home', 'intro', 'intro-1'])
+        self.assertEqual(len(headings), len(result.headings))
+
+    def test_missing_content_directory(self):
+        self.assertRaises(ValueError, lambda: build_site(os.path.join(self.directory.name, 'missing'), 'out'))
+
+class TestRenderSource(unittest.TestCase):
+    def test_diff_render_splits_the_page_once(self):
+        stats.reset()
+        stats.enable()
+        try:
+            page = render_source('page.md', '## Intro\n\n# Tom & **Jerry**\n\ntext\n', diff_renderer=PageDiffRenderer())
+        finally:
+            stats.disable()
+        self.assertIn('<title>Tom &amp; Jerry</title>', page)
+        self.assertEqual(stats.snapshot()['iter_classified_blocks']['calls'], 1)
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.directory.name, 'content')
+        self.output = os.path.join(self.directory.name, 'public')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unchanged_pages_are_skipped(self):
+        self.assertEqual(build_site(self.content, self.output, jobs=1).rendered, ['blog/post.md', 'index.md'])
+        self.assertEqual(build_site(self.content, self.output, jobs=1).rendered, [])
+        self.assertTrue(os.path.exists(manifest_path_for(self.output)))
+
+    def test_changed_page_is_rerendered(self):
+        build_site(self.content, self.output, jobs=1)
+        write_file(os.path.join(self.content, 'index.md'), '# New home\n')
+        self.assertEqual(build_site(self.content, self.output, jobs=1).rendered, ['index.md'])
+        with open(os.path.join(self.output, 'index.html')) as file:
+            self.assertIn('<h1 id="new-home">New home</h1>', file.read())
+
+    def test_removed_page_output_is_deleted(self):
+        build_site(self.content, self.output, jobs=1)
+        os.remove(os.path.join(self.content, 'blog', 'post.md'))
+        self.assertEqual(build_site(self.content, self.output, jobs=1).removed, ['blog/post.md'])
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'blog')))
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'index.html')))
+
+    def test_missing_output_is_rerendered(self):
+        build_site(self.content, self.output, jobs=1)
+        os.remove(os.path.join(self.output, 'index.html'))
+        self.assertEqual(build_site(self.content, self.output, jobs=1).rendered, ['index.md'])
+
+    def test_version_change_or_force_rerenders_everything(self):
+        build_site(self.content, self.output, jobs=1)
+        self.assertEqual(len(build_site(self.content, self.output, jobs=1, force=True).rendered), 2)
+        manifest = load_manifest(manifest_path_for(self.output))
+        manifest['generator_version'] = 'old'
+        save_manifest(manifest_path_for(self.output), manifest)
+        self.assertEqual(len(build_site(self.content, self.output, jobs=1).rendered), 2)
+
+    def test_template_change_rerenders_everything(self):
+        template_path = os.path.join(self.directory.name, 'template.html')
+        write_file(template_path, '<title>{{ Title }}</title>{{ Content }}')
+        build_site(self.content, self.output, jobs=1, template_path=template_path)
+        with open(os.path.join(self.output, 'index.html')) as file:
+            self.assertEqual(file.read(), '<title>Home</title><div><h1 id="home">Home</h1></div>')
+        self.assertEqual(build_site(self.content, self.output, jobs=1, template_path=template_path).rendered, [])
+        write_file(template_path, '<main>{{ Content }}</main>')
+        result = build_site(self.content, self.output, jobs=1, template_path=template_path)
+        self.assertEqual(result.rendered, ['blog/post.md', 'index.md'])
+        with open(os.path.join(self.output, 'index.html')) as file:
+            self.assertEqual(file.read(), '<main><div><h1 id="home">Home</h1></div></main>')
+
+    def test_fragment_cache_on_disk_is_reused(self):
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        # Headings skip the cache, so give each page a block that uses it.
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nWelcome.\n')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nHello.\n')
+        first = build_site(self.content, self.output, jobs=1, cache_dir=cache_dir)
+        self.assertEqual(first.cache_stats['misses'], 2)
+        second = build_site(self.content, os.path.join(self.directory.name, 'other'), jobs=1, cache_size=0, cache_dir=cache_dir)
+        self.assertEqual(second.cache_stats, {'hits': 0, 'disk_hits': 2, 'misses': 0})
+
+class TestMakeBatches(unittest.TestCase):
+    def test_small_files_share_a_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            names = [f'{i}.md' for i in range(10)]
+            for name in names:
+                write_file(os.path.join(directory, name), 'tiny\n')
+            self.assertEqual(make_batches(directory, names, jobs=4), [names])
+
+    def test_large_files_are_split_across_batches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            names = [f'{i}.md' for i in range(4)]
+            for name in names:
+                write_file(os.path.join(directory, name), 'x' * MIN_BATCH_BYTES)
+            self.assertEqual(make_batches(directory, names, jobs=4), [[name] for name in names])
+
+
+if __name__ == '__main__':
+    unittest.main()
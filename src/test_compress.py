@@ -0,0 +1,91 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from assets import sync_static
+from build import build_site, load_manifest, manifest_path_for
+from compress import *
+from test_assets import write_file
+
+
+class TestCompressOutput(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'public')
+        write_file(os.path.join(self.output, 'index.html'), '<p>repeated text</p>' * 100)
+        write_file(os.path.join(self.output, 'css', 'styles.css'), 'body { margin: 0; }\n' * 50)
+        write_file(os.path.join(self.output, 'tiny.js'), 'x()')
+        write_file(os.path.join(self.output, 'logo.svg'), '<svg></svg>' * 100)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_sidecar(self, relative_path: str) -> str:
+        with gzip.open(os.path.join(self.output, relative_path + '.gz'), 'rt') as file:
+            return file.read()
+
+    def test_writes_sidecars_worth_keeping(self):
+        report = compress_output(self.output)
+        self.assertEqual(report.compressed, ['css/styles.css', 'index.html'])
+        self.assertEqual(report.not_worth_it, ['tiny.js'])
+        self.assertEqual(self.read_sidecar('index.html'), '<p>repeated text</p>' * 100)
+        self.assertEqual(report.bytes_out, os.path.getsize(os.path.join(self.output, 'index.html.gz')) +
+                         os.path.getsize(os.path.join(self.output, 'css', 'styles.css.gz')))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'tiny.js.gz')))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'logo.svg.gz')))
+
+    def test_skips_unchanged_and_touched_files(self):
+        compress_output(self.output)
+        os.utime(os.path.join(self.output, 'index.html'), ns=(0, 0))
+        report = compress_output(self.output)
+        self.assertEqual(report.compressed, [])
+        self.assertEqual(report.skipped, ['css/styles.css', 'index.html', 'tiny.js'])
+
+    def test_recompresses_changed_files_settings_and_missing_sidecars(self):
+        compress_output(self.output)
+        write_file(os.path.join(self.output, 'index.html'), '<p>new text</p>' * 100)
+        os.remove(os.path.join(self.output, 'css', 'styles.css.gz'))
+        self.assertEqual(compress_output(self.output).compressed, ['css/styles.css', 'index.html'])
+        self.assertEqual(self.read_sidecar('index.html'), '<p>new text</p>' * 100)
+        self.assertEqual(compress_output(self.output, level=1).compressed, ['css/styles.css', 'index.html'])
+        report = compress_output(self.output, level=1, min_savings=10**6)
+        self.assertEqual(report.not_worth_it, ['css/styles.css', 'index.html', 'tiny.js'])
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'index.html.gz')))
+
+    def test_removes_sidecars_of_removed_pages(self):
+        content = os.path.join(self.directory.name, 'content')
+        write_file(os.path.join(content, 'blog', 'post.md'), '# Post\n\n' + 'Some text.\n\n' * 50)
+        build_site(content, self.output, jobs=1)
+        compress_output(self.output)
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'blog', 'post.html.gz')))
+        os.remove(os.path.join(content, 'blog', 'post.md'))
+        # The build removes the sidecar with the page, even without compressing.
+        build_site(content, self.output, jobs=1)
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'blog')))
+        compress_output(self.output)
+        self.assertNotIn('blog/post.html', load_manifest(manifest_path_for(self.output))['compressed'])
+
+    def test_rewritten_outputs_lose_their_sidecars(self):
+        content = os.path.join(self.directory.name, 'content')
+        static = os.path.join(self.directory.name, 'static')
+        write_file(os.path.join(content, 'post.md'), '# Post\n\n' + 'Some text.\n\n' * 50)
+        write_file(os.path.join(static, 'site.css'), 'p { color: red; }\n' * 50)
+        write_file(os.path.join(static, 'shipped.css'), 'p { color: red; }\n' * 50)
+        write_file(os.path.join(static, 'shipped.css.gz'), 'precompressed')
+        build_site(content, self.output, jobs=1)
+        sync_static(static, self.output)
+        self.assertIn('post.html', compress_output(self.output).compressed)
+        write_file(os.path.join(content, 'post.md'), '# Changed\n\n' + 'Some text.\n\n' * 50)
+        write_file(os.path.join(static, 'site.css'), 'p { color: blue; }\n' * 50)
+        write_file(os.path.join(static, 'shipped.css'), 'p { color: blue; }\n' * 50)
+        build_site(content, self.output, jobs=1)
+        sync_static(static, self.output)
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'post.html.gz')))
+        self.assertFalse(os.path.exists(os.path.join(self.output, 'site.css.gz')))
+        # A sidecar that is itself a static file is not removed.
+        self.assertTrue(os.path.exists(os.path.join(self.output, 'shipped.css.gz')))
+
+
+if __name__ == '__main__':
+    unittest.main()
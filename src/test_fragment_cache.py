@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+
+from blocks import BlockType
+from fragment_cache import *
+from render import markdown_to_html, markdown_to_html_node
+
+
+class TestFragmentCache(unittest.TestCase):
+    def test_key_depends_on_text_type_and_version(self):
+        cache = FragmentCache('1')
+        key = cache.key(BlockType.PARAGRAPH, ['Hello'])
+        self.assertEqual(key, cache.key(BlockType.PARAGRAPH, ['Hello']))
+        self.assertNotEqual(key, cache.key(BlockType.PARAGRAPH, ['Hello!']))
+        self.assertNotEqual(key, cache.key(BlockType.QUOTE, ['Hello']))
+        self.assertNotEqual(key, FragmentCache('2').key(BlockType.PARAGRAPH, ['Hello']))
+
+    def test_counts_hits_and_misses(self):
+        cache = FragmentCache('1')
+        self.assertEqual(cache.get('a'), None)
+        cache.put('a', '<p>a</p>')
+        self.assertEqual(cache.get('a'), '<p>a</p>')
+        self.assertEqual(cache.stats(), {'hits': 1, 'disk_hits': 0, 'misses': 1, 'entries': 1})
+
+    def test_evicts_least_recently_used(self):
+        cache = FragmentCache('1', max_entries=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+        self.assertEqual(list(cache.entries), ['a', 'c'])
+
+    def test_disk_store_is_shared_between_caches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            FragmentCache('1', cache_dir=directory).put('abcdef', '<p>shared</p>')
+            other = FragmentCache('1', cache_dir=directory)
+            self.assertEqual(other.get('abcdef'), '<p>shared</p>')
+            self.assertEqual(other.get('abcdef'), '<p>shared</p>')
+            self.assertEqual((other.hits, other.disk_hits, other.misses), (1, 1, 0))
+
+class TestCachedRender(unittest.TestCase):
+    def test_cached_render_matches_full_render(self):
+        md = "# Title\n\nA _shared_ disclaimer.\n\n- a\n- b\n\nA _shared_ disclaimer.\n\n```\ncode\n```"
+        cache = FragmentCache('1')
+        self.assertEqual(markdown_to_html(md, cache), markdown_to_html_node(md).to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertEqual(markdown_to_html(md, cache), markdown_to_html_node(md).to_html())
+        self.assertEqual((cache.hits, cache.misses), (5, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
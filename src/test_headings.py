@@ -0,0 +1,51 @@
+import io
+import unittest
+
+from headings import *
+import render
+
+
+class TestSlugs(unittest.TestCase):
+    def test_slugify(self):
+        self.assertEqual(slugify('Intro & Welcome'), 'intro--welcome')
+        self.assertEqual(slugify('  Déjà vu, again!  '), 'déjà-vu-again')
+        self.assertEqual(slugify('???'), 'section')
+
+    def test_unique_slug(self):
+        seen = {}
+        slugs = [unique_slug(slug, seen) for slug in ['a', 'a', 'a-1', 'a']]
+        self.assertEqual(slugs, ['a', 'a-1', 'a-1-1', 'a-2'])
+
+class TestHeadingIndex(unittest.TestCase):
+    def test_render_records_headings(self):
+        heading_index = HeadingIndex()
+        md = '# Fish & **Chips**\n\ntext\n\n## `code` ![logo](/l.png) and [a link](x.html)\n\n## Fish & Chips'
+        html = render.markdown_to_html_node(md, heading_index).to_html()
+        self.assertEqual(heading_index.headings, [Heading(1, 'Fish & Chips', 'fish--chips'),
+                                                  Heading(2, 'code  and a link', 'code--and-a-link'),
+                                                  Heading(2, 'Fish & Chips', 'fish--chips-1')])
+        self.assertIn('<h2 id="fish--chips-1">', html)
+        self.assertEqual(render.index_headings(io.StringIO(md)).to_rows(), heading_index.to_rows())
+
+    def test_toc_nests_by_level(self):
+        heading_index = HeadingIndex()
+        for level, text in [(2, 'A'), (3, 'B'), (1, 'C'), (3, 'D'), (2, 'E')]:
+            heading_index.add(level, text)
+        self.assertEqual(heading_index.toc_html(),
+                         '<ul><li><a href="#a">A</a><ul><li><a href="#b">B</a></li></ul></li>'
+                         '<li><a href="#c">C</a><ul><li><a href="#d">D</a></li><li><a href="#e">E</a></li></ul></li></ul>')
+
+    def test_title_is_the_first_h1(self):
+        md = '## Intro\n\n#   Tom & **Jerry**  \n\n# Later'
+        heading_index = HeadingIndex()
+        render.markdown_to_html_node(md, heading_index)
+        self.assertEqual(heading_index.title(), render.extract_title(md))
+        self.assertEqual(HeadingIndex().title(), None)
+
+    def test_no_headings_no_toc(self):
+        self.assertEqual(HeadingIndex().toc_node(), None)
+        self.assertEqual(HeadingIndex().toc_html(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
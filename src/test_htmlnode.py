@@ -1,4 +1,6 @@
 from htmlnode import *
+import html
+import io
 import unittest
 
 class TestHTMLNode(unittest.TestCase):
@@ -24,6 +26,17 @@ class TestHTMLNode(unittest.TestCase):
         my_node = HTMLNode(tag='Mouse', value='house', props=dict())
         self.assertEqual(my_node.props_to_htlm(), '')
 
+    def test_props_values_are_escaped(self):
+        my_node = HTMLNode(tag='a', props={'href': 'https://example.com/?a=1&b="2"', 'title': '<tip>'})
+        self.assertEqual(my_node.props_to_htlm(), ' href="https://example.com/?a=1&amp;b=&quot;2&quot;" title="&lt;tip&gt;"')
+
+    def test_props_cache_follows_mutation(self):
+        props_dict = {"href": "https://www.google.com"}
+        my_node = HTMLNode(tag='a', props=props_dict)
+        self.assertEqual(my_node.props_to_htlm(), ' href="https://www.google.com"')
+        props_dict["href"] = "https://www.boot.dev"
+        self.assertEqual(my_node.props_to_htlm(), ' href="https://www.boot.dev"')
+
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_with_tag(self):
         node = LeafNode('p', 'Hello, world!')
@@ -37,10 +50,28 @@ class TestLeafNode(unittest.TestCase):
         node = LeafNode("a", "Click me!", {"href": "https://www.google.com"})
         self.assertEqual(node.to_html(), '<a href="https://www.google.com">Click me!</a>')
     
+    def test_leaf_with_uncommon_tag(self):
+        self.assertEqual(LeafNode('mark', 'hi').to_html(), '<mark>hi</mark>')
+        self.assertEqual(OPEN_TAGS['mark'], '<mark>')
+
+    def test_values_are_escaped(self):
+        self.assertEqual(LeafNode('code', 'a < b && c > "d"').to_html(), '<code>a &lt; b &amp;&amp; c &gt; "d"</code>')
+        self.assertEqual(LeafNode(None, '&lt;').to_html(), '&amp;lt;')
+        self.assertEqual(LeafNode('a', 'x & y', {'href': '/?q=1&r=2'}).to_html(), '<a href="/?q=1&amp;r=2">x &amp; y</a>')
+
+    def test_escaping_matches_html_escape(self):
+        for text in ['', 'plain prose', '<&>"\'', "it's \"quoted\"", '&&&<<>>', 'a&amp;b', 'ünïcode < ✓']:
+            self.assertEqual(escape_text(text), html.escape(text, quote=False))
+            self.assertEqual(escape_attribute(text), html.escape(text))
+
     def test_raises_value_error_when_no_value_provided(self):
         node = LeafNode('a', None)
         self.assertRaises(ValueError, node.to_html)
 
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(LeafNode('p', 'text'), '__dict__'))
+        self.assertFalse(hasattr(ParentNode('p', []), '__dict__'))
+
 class TestParentNode(unittest.TestCase):
     def test_parent_to_html_with_multiple_children(self):
         node = ParentNode(
@@ -95,5 +126,49 @@ class TestParentNode(unittest.TestCase):
         )
 
 
+class TestStreamingSerializer(unittest.TestCase):
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")]),
+                                  LeafNode("a", "link", {"href": "https://www.boot.dev"})])
+        self.assertEqual(''.join(iter_html(node)), node.to_html())
+        self.assertEqual(node.to_html(), '<div><p><b>Bold</b> text</p><a href="https://www.boot.dev">link</a></div>')
+
+    def test_write_html_to_file(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")]), ParentNode("li", [LeafNode(None, "two")])])
+        out = io.StringIO()
+        write_html(node, out)
+        self.assertEqual(out.getvalue(), '<ul><li>one</li><li>two</li></ul>')
+
+    def test_deep_nesting_does_not_recurse(self):
+        node = LeafNode(None, 'deep')
+        for _ in range(5000):
+            node = ParentNode('span', [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith('<span>' * 5000 + 'deep</span>'))
+        self.assertEqual(len(html), len('<span></span>') * 5000 + len('deep'))
+
+class TestLazyParentNode(unittest.TestCase):
+    def test_children_are_built_while_serializing(self):
+        built = []
+        def children():
+            for i in range(3):
+                built.append(i)
+                yield ParentNode('p', [LeafNode(None, str(i))])
+        node = LazyParentNode('div', children())
+        self.assertEqual(built, [])
+        pieces = iter_html(node)
+        self.assertEqual([next(pieces), next(pieces), next(pieces)], ['<div>', '<p>', '0'])
+        self.assertEqual(built, [0])
+        self.assertEqual(''.join(pieces), '</p><p>1</p><p>2</p></div>')
+
+    def test_nested_lazy_nodes_and_lists(self):
+        node = LazyParentNode('ul', iter([ParentNode('li', [LeafNode('b', 'a')]),
+                                          LazyParentNode('li', (LeafNode(None, c) for c in 'xy'))]))
+        self.assertEqual(node.to_html(), '<ul><li><b>a</b></li><li>xy</li></ul>')
+
+    def test_empty_children(self):
+        self.assertEqual(LazyParentNode('div', iter([])).to_html(), '<div></div>')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
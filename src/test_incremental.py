@@ -0,0 +1,82 @@
+import random
+import unittest
+
+from fragment_cache import FragmentCache
+from incremental import PageDiffRenderer
+from inline import LinkIndex
+import render
+
+BLOCKS = [
+    '# Title',
+    '## Section with **bold**',
+    'A paragraph with _italic_ and `code`.',
+    'Another paragraph\nover two lines with a [link](https://example.com).',
+    '- one\n- two\n- three',
+    '1. first\n2. second',
+    '> quoted\n> text',
+    '```\nprint("hi")\n```',
+    'Image ![alt](/a.png) here.',
+]
+
+
+class TestPageDiffRenderer(unittest.TestCase):
+    def test_first_render_matches_full_render(self):
+        md = '\n\n'.join(BLOCKS)
+        renderer = PageDiffRenderer()
+        self.assertEqual(renderer.render('page.md', md), render.markdown_to_html_node(md).to_html())
+        self.assertEqual(renderer.blocks_rendered, len(BLOCKS))
+        self.assertEqual(renderer.blocks_reused, 0)
+
+    def test_single_edit_renders_one_block(self):
+        renderer = PageDiffRenderer()
+        renderer.render('page.md', '\n\n'.join(BLOCKS))
+        edited = list(BLOCKS)
+        edited[4] = '- one\n- two\n- four'
+        md = '\n\n'.join(edited)
+        self.assertEqual(renderer.render('page.md', md), render.markdown_to_html_node(md).to_html())
+        # The edited block, plus the two headings, which are always rendered.
+        self.assertEqual(renderer.blocks_rendered, len(BLOCKS) + 3)
+        self.assertEqual(renderer.blocks_reused, len(BLOCKS) - 3)
+
+    def test_insert_and_delete(self):
+        renderer = PageDiffRenderer()
+        renderer.render('page.md', '\n\n'.join(BLOCKS))
+        edited = BLOCKS[:2] + ['A new paragraph.'] + BLOCKS[2:5] + BLOCKS[6:]
+        md = '\n\n'.join(edited)
+        self.assertEqual(renderer.render('page.md', md), render.markdown_to_html_node(md).to_html())
+        self.assertEqual(renderer.blocks_rendered, len(BLOCKS) + 3)
+
+    def test_pages_are_independent(self):
+        renderer = PageDiffRenderer()
+        renderer.render('a.md', '# A\n\ntext')
+        self.assertEqual(renderer.render('b.md', '# B'), '<div><h1 id="b">B</h1></div>')
+        renderer.forget('a.md')
+        self.assertEqual(renderer.render('a.md', '# A\n\ntext'), '<div><h1 id="a">A</h1><p>text</p></div>')
+        self.assertEqual(renderer.blocks_reused, 0)
+
+    def test_random_edits_are_byte_identical(self):
+        rng = random.Random(17)
+        for cache in (None, FragmentCache(render.RENDERER_VERSION)):
+            renderer = PageDiffRenderer(cache)
+            page = [rng.choice(BLOCKS) for _ in range(20)]
+            for _ in range(200):
+                position = rng.randrange(len(page) + 1)
+                match rng.randrange(3):
+                    case 0:
+                        page.insert(position, rng.choice(BLOCKS))
+                    case 1:
+                        if page:
+                            del page[min(position, len(page) - 1)]
+                    case 2:
+                        if page:
+                            page[min(position, len(page) - 1)] = rng.choice(BLOCKS)
+                md = '\n\n'.join(page)
+                link_index = LinkIndex()
+                expected_links = LinkIndex()
+                self.assertEqual(renderer.render('page.md', md, link_index=link_index),
+                                 render.markdown_to_html_node(md, link_index=expected_links).to_html())
+                self.assertEqual(link_index.references, expected_links.references)
+
+
+if __name__ == "__main__":
+    unittest.main()
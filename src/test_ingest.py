@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+
+from ingest import *
+
+
+class TestMappedLines(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_matches_text_mode(self, data: bytes):
+        path = os.path.join(self.directory.name, 'page.md')
+        with open(path, 'wb') as file:
+            file.write(data)
+        with open(path, encoding='utf-8') as file:
+            expected = list(file)
+        with map_source(path) as buffer:
+            self.assertEqual(list(iter_mapped_lines(buffer)), expected)
+
+    def test_matches_text_mode_reading(self):
+        for data in [b'', b'\n', b'# Title\n\nText\n', b'no final newline', b'a\r\nb\rc\n\r\n\n',
+                     'café  \n \n- ☃\n'.encode(), b'\n\n\nend\r']:
+            self.check_matches_text_mode(data)
+
+    def test_invalid_utf8_raises_value_error(self):
+        self.assertRaises(ValueError, lambda: list(iter_mapped_lines(b'ok\n\xff\n')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from inline import *
+from render import text_to_children
+
+
+def to_html(markdown: str) -> str:
+    return ''.join(node.to_html() for node in text_to_children(markdown))
+
+
+class TestParseInline(unittest.TestCase):
+    def test_flat_spans(self):
+        self.assertEqual(parse_inline('a **b** _c_ `d`'), [
+            InlineNode(TextType.TEXT, 'a '),
+            InlineNode(TextType.BOLD, children=[InlineNode(TextType.TEXT, 'b')]),
+            InlineNode(TextType.TEXT, ' '),
+            InlineNode(TextType.ITALIC, children=[InlineNode(TextType.TEXT, 'c')]),
+            InlineNode(TextType.TEXT, ' '),
+            InlineNode(TextType.CODE, 'd'),
+        ])
+
+    def test_links_and_images(self):
+        self.assertEqual(parse_inline('![alt](a.png) [text](https://en.wikipedia.org/wiki/A_(b))'), [
+            InlineNode(TextType.IMAGE, 'alt', 'a.png'),
+            InlineNode(TextType.TEXT, ' '),
+            InlineNode(TextType.LINK, 'text', 'https://en.wikipedia.org/wiki/A_(b)'),
+        ])
+
+    def test_nested_emphasis(self):
+        self.assertEqual(to_html('a **bold _and italic_ text** b'), 'a <b>bold <i>and italic</i> text</b> b')
+        self.assertEqual(to_html('_italic **and bold**_'), '<i>italic <b>and bold</b></i>')
+        self.assertEqual(to_html('**see [docs](https://boot.dev) now**'),
+                         '<b>see <a href="https://boot.dev">docs</a> now</b>')
+
+    def test_code_spans_are_literal(self):
+        self.assertEqual(to_html('`a **b** _c_`'), '<code>a **b** _c_</code>')
+        self.assertEqual(to_html('**x `y**` z**'), '<b>x <code>y**</code> z</b>')
+        self.assertEqual(to_html('``a ` b``'), '<code>a ` b</code>')
+
+    def test_unmatched_delimiters_are_text(self):
+        self.assertEqual(to_html('This is **bold'), 'This is **bold')
+        self.assertEqual(to_html('A `code span'), 'A `code span')
+        self.assertEqual(to_html('a ** b _ c'), 'a ** b _ c')
+        self.assertEqual(to_html('_a **b_ c**'), '<i>a **b</i> c**')
+
+    def test_intraword_underscores(self):
+        self.assertEqual(to_html('snake_case_name and _this_'), 'snake_case_name and <i>this</i>')
+
+    def test_leftover_run_characters(self):
+        self.assertEqual(to_html('****x**'), '**<b>x</b>')
+
+    def test_deep_nesting_renders(self):
+        depth = 3000
+        markdown = '**a _' * depth + 'x' + '_ b**' * depth
+        self.assertEqual(to_html(markdown), '<b>a <i>' * depth + 'x' + '</i> b</b>' * depth)
+        self.assertEqual(parse_inline(markdown), parse_inline(markdown))
+        self.assertNotEqual(parse_inline(markdown), parse_inline(markdown[:-3] + '_'))
+
+
+if __name__ == "__main__":
+    unittest.main()
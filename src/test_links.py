@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build import build_site, load_manifest, manifest_path_for
+from links import *
+from test_build import write_file
+
+
+class TestResolveTarget(unittest.TestCase):
+    def test_resolution(self):
+        self.assertEqual(resolve_target('blog/post.html', 'other.html#top'), ('blog/other.html', 'top'))
+        self.assertEqual(resolve_target('blog/post.html', '../index.html'), ('index.html', ''))
+        self.assertEqual(resolve_target('blog/post.html', '/'), ('index.html', ''))
+        self.assertEqual(resolve_target('blog/post.html', '/docs/'), ('docs/index.html', ''))
+        self.assertEqual(resolve_target('blog/post.html', '#heading'), ('blog/post.html', 'heading'))
+        self.assertEqual(resolve_target('index.html', 'a%20b.png?v=2'), ('a b.png', ''))
+        for target in ['https://example.com/x', '//cdn.example.com/x.js', 'mailto:me@example.com']:
+            self.assertEqual(resolve_target('index.html', target), None)
+
+class TestCheckSite(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.directory.name, 'content')
+        self.output = os.path.join(self.directory.name, 'public')
+        write_file(os.path.join(self.content, 'index.md'),
+                   '# Home\n\n[post](blog/post.html#a-post) [docs](docs) [gone](gone.html)\n\n[top](#home) [nope](#nope)\n')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# A post\n\n[home](../index.html#missing)\n')
+        write_file(os.path.join(self.content, 'docs', 'index.md'), '# Docs\n\n![logo](/logo.png)\n')
+        write_file(os.path.join(self.output, 'logo.png'), 'png')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reports_broken_links_with_lines(self):
+        build_site(self.content, self.output, jobs=1)
+        broken = [(link.page, link.line, link.target, link.reason) for link in check_site(self.output)]
+        self.assertEqual(broken, [('blog/post.md', 3, '../index.html#missing', 'no such heading'),
+                                  ('index.md', 3, 'gone.html', 'no such file'),
+                                  ('index.md', 5, '#nope', 'no such heading')])
+
+    def test_links_come_from_the_build(self):
+        build_site(self.content, self.output, jobs=1)
+        manifest_path = manifest_path_for(self.output)
+        manifest = load_manifest(manifest_path)
+        self.assertEqual(manifest['links']['docs/index.md'], [[3, '/logo.png']])
+        # Make the stored rows for an unchanged page recognisably stale.
+        manifest['links']['docs/index.md'] = [[1, 'stale.html']]
+        with open(manifest_path, 'w') as file:
+            json.dump(manifest, file)
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n')
+        build_site(self.content, self.output, jobs=1)
+        broken = [(link.page, link.target) for link in check_site(self.output)]
+        self.assertEqual(broken, [('blog/post.md', '../index.html#missing'), ('docs/index.md', 'stale.html')])
+
+    def test_generator_version_change_resets_links(self):
+        build_site(self.content, self.output, jobs=1)
+        manifest_path = manifest_path_for(self.output)
+        manifest = load_manifest(manifest_path)
+        manifest['generator_version'] = 'old'
+        manifest['links']['docs/index.md'] = [[1, 'stale.html']]
+        with open(manifest_path, 'w') as file:
+            json.dump(manifest, file)
+        build_site(self.content, self.output, jobs=1)
+        self.assertEqual(load_manifest(manifest_path)['links']['docs/index.md'], [[3, '/logo.png']])
+        broken = [(link.page, link.target) for link in check_site(self.output)]
+        self.assertNotIn(('docs/index.md', 'stale.html'), broken)
+
+if __name__ == '__main__':
+    unittest.main()
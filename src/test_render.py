@@ -0,0 +1,108 @@
+import io
+import unittest
+
+from render import *
+
+
+class TestMarkdownToHTMLNode(unittest.TestCase):
+    def test_paragraphs(self):
+        md = """
+This is **bolded** paragraph
+text in a p
+tag here
+
+This is another paragraph with _italic_ text and `code` here
+
+"""
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            "<div><p>This is <b>bolded</b> paragraph text in a p tag here</p><p>This is another paragraph with <i>italic</i> text and <code>code</code> here</p></div>",
+        )
+
+    def test_codeblock(self):
+        md = """
+```
+This is text that _should_ remain
+the **same** even with inline stuff
+```
+"""
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
+        )
+
+    def test_codeblock_info_string_is_dropped(self):
+        html = markdown_to_html_node("```python\nprint('hi')\n```").to_html()
+        self.assertEqual(html, "<div><pre><code>print('hi')\n</code></pre></div>")
+
+    def test_headings(self):
+        html = markdown_to_html_node("# Title\n\n### A **bold** section").to_html()
+        self.assertEqual(html, '<div><h1 id="title">Title</h1><h3 id="a-bold-section">A <b>bold</b> section</h3></div>')
+
+    def test_quote(self):
+        html = markdown_to_html_node("> A quote\n> across _two_ lines").to_html()
+        self.assertEqual(html, "<div><blockquote>A quote across <i>two</i> lines</blockquote></div>")
+
+    def test_lists(self):
+        md = "- one\n- **two**\n\n1. first\n2. [second](https://www.boot.dev)"
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(
+            html,
+            '<div><ul><li>one</li><li><b>two</b></li></ul><ol><li>first</li><li><a href="https://www.boot.dev">second</a></li></ol></div>',
+        )
+
+class TestEscaping(unittest.TestCase):
+    def test_text_and_code_are_escaped(self):
+        md = "# Fish & Chips\n\nIf a < b then `a <= b`\n\n```\n<div>&nbsp;</div>\n```"
+        self.assertEqual(markdown_to_html_node(md).to_html(),
+                         '<div><h1 id="fish--chips">Fish &amp; Chips</h1><p>If a &lt; b then <code>a &lt;= b</code></p>'
+                         '<pre><code>&lt;div&gt;&amp;nbsp;&lt;/div&gt;\n</code></pre></div>')
+
+class TestLinesToLazyHTMLNode(unittest.TestCase):
+    def test_matches_markdown_to_html_node(self):
+        md = "# Title\n\nSome **bold** text\nacross lines\n\n- a\n- b\n\n```\ncode\n```\n"
+        self.assertEqual(lines_to_lazy_html_node(io.StringIO(md)).to_html(), markdown_to_html_node(md).to_html())
+
+class TestLinkIndex(unittest.TestCase):
+    md = ('# Intro & **Welcome**\n\nSee [a](a.html) and\n![b](b.png), not `[c](c.html)`\n\n'
+          '## Intro & [Welcome](w.html)\n\n- [d](d.html)\n- [e](\n\n> quote with\n> [f](f.html#x)\n\n'
+          '```\n[g](g.html)\n```\n\nA [split\nlink](h.html)\n')
+    references = [(3, 'a.html'), (4, 'b.png'), (6, 'w.html'), (8, 'd.html'), (12, 'f.html#x'), (18, 'h.html')]
+
+    def test_references_with_lines(self):
+        link_index = LinkIndex()
+        markdown_to_html_node(self.md, link_index=link_index)
+        self.assertEqual(link_index.references, self.references)
+        link_index = LinkIndex()
+        lines_to_lazy_html_node(io.StringIO(self.md), link_index=link_index).to_html()
+        self.assertEqual(link_index.references, self.references)
+
+    def test_cached_blocks_are_indexed(self):
+        cache = FragmentCache(RENDERER_VERSION)
+        for _ in range(2):
+            link_index = LinkIndex()
+            self.assertEqual(markdown_to_html(self.md, cache, link_index=link_index),
+                             markdown_to_html_node(self.md).to_html())
+            self.assertEqual(link_index.references, self.references)
+        self.assertEqual(cache.hits, 5)
+
+class TestExtractTitle(unittest.TestCase):
+    def test_first_h1(self):
+        self.assertEqual(extract_title("## Not this\n\n#   Hello  \n\n# Later"), "Hello")
+
+    def test_no_h1(self):
+        self.assertRaises(ValueError, lambda: extract_title("## Only h2"))
+
+    def test_from_lines_stops_at_first_h1(self):
+        lines = iter(["## Not this\n", "\n", "# Hello\n", "\n", "rest\n"])
+        self.assertEqual(extract_title_from_lines(lines), "Hello")
+        self.assertEqual(list(lines), ["rest\n"])
+
+    def test_inline_markup_is_dropped(self):
+        self.assertEqual(extract_title("# Tom & <Jerry> **bold** [link](x.html)"), "Tom & <Jerry> bold link")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import blocks
+import htmlnode
+import stats
+import inline
+from render import markdown_to_html_node
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        stats.reset()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_disabled_by_default_and_restored_after_disable(self):
+        original = inline.parse_inline
+        self.assertFalse(stats.is_enabled())
+        stats.enable()
+        self.assertIsNot(inline.parse_inline, original)
+        stats.disable()
+        self.assertIs(inline.parse_inline, original)
+
+    def test_counts_each_stage(self):
+        stats.enable()
+        markdown_to_html_node('# Title\n\nSome **bold** text\n\n- a\n- b').to_html()
+        blocks.block_to_block_type('# Title')
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot['iter_classified_blocks']['produced'], 3)
+        self.assertEqual(snapshot['parse_inline']['calls'], 4)
+        self.assertEqual(snapshot['inline_node_to_html_node']['calls'], 6)
+        self.assertEqual(snapshot['block_to_block_type']['calls'], 1)
+        self.assertEqual(snapshot['to_html']['calls'], 1)
+        self.assertEqual(snapshot['to_html']['produced'], len('<div><h1 id="title">Title</h1><p>Some <b>bold</b> text</p><ul><li>a</li><li>b</li></ul></div>'))
+
+    def test_nested_to_html_is_not_counted_twice(self):
+        stats.enable()
+        htmlnode.ParentNode('div', [htmlnode.ParentNode('p', [htmlnode.LeafNode(None, 'x')])]).to_html()
+        self.assertEqual(stats.snapshot()['to_html']['calls'], 1)
+
+    def test_reentrant_calls_are_measured_once(self):
+        calls = []
+        def nested(depth: int) -> int:
+            calls.append(depth)
+            return depth if depth == 0 else measured(depth - 1)
+        stage = stats.StageStats()
+        measured = stats._measure(stage, nested, stats._count_one)
+        self.assertEqual(measured(3), 0)
+        self.assertEqual((stage.calls, stage.produced, len(calls)), (1, 1, 4))
+
+    def test_nested_emphasis_is_one_call(self):
+        stats.enable()
+        inline.inline_node_to_html_node(inline.parse_inline('**a _b **c** d_ e**')[0]).to_html()
+        self.assertEqual(stats.snapshot()['inline_node_to_html_node']['calls'], 1)
+
+    def test_merge(self):
+        total = {}
+        stats.merge(total, {'a': {'calls': 1, 'seconds': 0.5, 'produced': 2, 'unit': 'nodes'}})
+        stats.merge(total, {'a': {'calls': 2, 'seconds': 0.25, 'produced': 3, 'unit': 'nodes'}})
+        self.assertEqual(total, {'a': {'calls': 3, 'seconds': 0.75, 'produced': 5, 'unit': 'nodes'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
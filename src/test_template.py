@@ -0,0 +1,54 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import *
+
+
+class TestTemplate(unittest.TestCase):
+    def test_parses_literals_and_slots(self):
+        template = Template('<title>{{ Title }}</title><body>{{Content}}</body>')
+        self.assertEqual(template.literals, ['<title>', '</title><body>', '</body>'])
+        self.assertEqual(template.slots, ['Title', 'Content'])
+
+    def test_render(self):
+        template = Template('<h1>{{ Title }}</h1>{{ Content }}<footer>{{ Title }}</footer>')
+        page = template.render({'Title': 'Hi', 'Content': '<p>{{ Title }}</p>'})
+        self.assertEqual(page, '<h1>Hi</h1><p>{{ Title }}</p><footer>Hi</footer>')
+
+    def test_write_streams_segments(self):
+        out = io.StringIO()
+        Template('a{{ X }}b').write(out, {'X': '-'})
+        self.assertEqual(out.getvalue(), 'a-b')
+
+    def test_write_streams_iterable_values(self):
+        out = io.StringIO()
+        Template('<title>{{ Title }}</title>{{ Content }}!').write(out, {'Title': 'T', 'Content': iter(['<p>', 'x', '</p>'])})
+        self.assertEqual(out.getvalue(), '<title>T</title><p>x</p>!')
+
+    def test_missing_value(self):
+        self.assertRaises(ValueError, lambda: Template('{{ Title }}').render({}))
+
+    def test_no_slots(self):
+        self.assertEqual(Template('plain').render({}), 'plain')
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_reparses_only_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'template.html')
+            with open(path, 'w') as file:
+                file.write('<p>{{ Content }}</p>')
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w') as file:
+                file.write('<div>{{ Content }}</div>')
+            os.utime(path, ns=(0, 0))
+            second = load_template(path)
+            self.assertIsNot(second, first)
+            self.assertNotEqual(second.hash, first.hash)
+            self.assertEqual(second.render({'Content': 'x'}), '<div>x</div>')
+
+
+if __name__ == '__main__':
+    unittest.main()
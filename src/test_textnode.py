@@ -36,6 +36,11 @@ class TestTextNode(unittest.TestCase):
     def test_repr_with_url(self):
         node = TextNode("This is a text node", TextType.LINK, 'https://www.boot.dev')
         self.assertEqual(node.__repr__(), 'TextNode(This is a text node, link, https://www.boot.dev)')
+
+    def test_has_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.TEXT)
+        self.assertFalse(hasattr(node, '__dict__'))
+        self.assertRaises(AttributeError, lambda: setattr(node, 'extra', 1))
     
 class TestTextNodeToHTMLNode(unittest.TestCase):
     def test_text_text(self):
@@ -516,6 +521,58 @@ class TestTextToTextNodes(unittest.TestCase):
         
         self.assertEqual(text_to_textnodes(text), expected_nodes)
 
+    def test_later_delimiters_are_literal_inside_bold(self):
+        text = 'A **bold _not italic_ or `code`** word'
+        expected_nodes = [
+                TextNode("A ", TextType.TEXT),
+                TextNode("bold _not italic_ or `code`", TextType.BOLD),
+                TextNode(" word", TextType.TEXT),
+            ]
+        self.assertEqual(text_to_textnodes(text), expected_nodes)
+
+    def test_link_inside_bold_keeps_bold_type(self):
+        text = '**see [docs](https://boot.dev) now**'
+        expected_nodes = [
+                TextNode("see ", TextType.BOLD),
+                TextNode("docs", TextType.LINK, "https://boot.dev"),
+                TextNode(" now", TextType.BOLD),
+            ]
+        self.assertEqual(text_to_textnodes(text), expected_nodes)
+
+    def test_links_take_precedence_over_images(self):
+        text = 'See ![logo] and [docs](https://x.y) or ![img](a.png)'
+        expected_nodes = [
+                TextNode("See ![logo] and ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "https://x.y"),
+                TextNode(" or ", TextType.TEXT),
+                TextNode("img", TextType.IMAGE, "a.png"),
+            ]
+        self.assertEqual(text_to_textnodes(text), expected_nodes)
+
+    def test_unclosed_or_crossing_delimiters(self):
+        for text in ['This is **bold', 'This is _italic **and_ bold**', 'A `code _span` here_']:
+            self.assertRaises(ValueError, lambda: text_to_textnodes(text))
+
+
+class TestTextToTextSpans(unittest.TestCase):
+    def test_spans_match_text_nodes(self):
+        text = 'This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)'
+        spans = text_to_textspans(text)
+        self.assertEqual(spans, text_to_textnodes(text))
+        self.assertTrue(all(span.source is text for span in spans))
+
+    def test_span_offsets(self):
+        text = 'Read **this** now'
+        span = text_to_textspans(text)[1]
+        self.assertEqual((span.start, span.end, span.type), (7, 11, TextType.BOLD))
+        self.assertEqual(span.text, 'this')
+        self.assertEqual(repr(span), 'TextSpan(this, bold, None)')
+
+    def test_span_to_html_node(self):
+        span = text_to_textspans('[link](https://boot.dev)')[0]
+        html_node = text_node_to_html_node(span)
+        self.assertEqual(html_node.to_html(), '<a href="https://boot.dev">link</a>')
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import build
+from watch import *
+
+
+def write_file(path: str, contents: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(contents)
+
+
+class TestWatchers(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, 'content')
+        self.page = os.path.join(self.root, 'index.md')
+        write_file(self.page, '# Home\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_watcher(self, watcher):
+        try:
+            self.assertEqual(watcher.wait(0), set())
+            write_file(self.page, '# New home, longer\n')
+            self.assertIn(self.page, watcher.wait(2.0))
+            new_page = os.path.join(self.root, 'blog', 'post.md')
+            write_file(new_page, '# Post\n')
+            changed = watcher.wait(2.0)
+            changed.update(watcher.wait(0.2))
+            self.assertIn(new_page, changed)
+            os.remove(self.page)
+            self.assertIn(self.page, watcher.wait(2.0))
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher([self.root], interval=0.01))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher([self.root])
+        except OSError:
+            self.skipTest('inotify is not available')
+        self.check_watcher(watcher)
+
+class TestHandleChanges(unittest.TestCase):
+    def test_renders_changed_pages_and_copies_static_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            content = os.path.join(directory, 'content')
+            static = os.path.join(directory, 'static')
+            output = os.path.join(directory, 'public')
+            write_file(os.path.join(content, 'index.md'), '# Home\n')
+            write_file(os.path.join(content, 'other.md'), '# Other\n')
+            build.build_site(content, output, jobs=1)
+            write_file(os.path.join(content, 'index.md'), '# Changed\n')
+            write_file(os.path.join(static, 'styles.css'), 'body {}')
+            os.remove(os.path.join(content, 'other.md'))
+
+            result = handle_changes(content, static, output, {os.path.join(content, 'index.md'),
+                                                              os.path.join(content, 'other.md'),
+                                                              os.path.join(static, 'styles.css')})
+            self.assertEqual((result.rendered, result.removed), (['index.md'], ['other.md']))
+            with open(os.path.join(output, 'index.html')) as file:
+                self.assertIn('<h1 id="changed">Changed</h1>', file.read())
+            self.assertTrue(os.path.exists(os.path.join(output, 'styles.css')))
+            self.assertFalse(os.path.exists(os.path.join(output, 'other.html')))
+            self.assertEqual(build.build_site(content, output, jobs=1).rendered, [])
+
+    def test_diff_renderer_reuses_unchanged_blocks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            content = os.path.join(directory, 'content')
+            output = os.path.join(directory, 'public')
+            index = os.path.join(content, 'index.md')
+            write_file(index, '# Home\n\nfirst\n\nsecond\n')
+            build.build_site(content, output, jobs=1)
+            renderer = PageDiffRenderer()
+            handle_changes(content, None, output, {index}, diff_renderer=renderer)
+            write_file(index, '# Home\n\nfirst\n\nchanged\n')
+            handle_changes(content, None, output, {index}, diff_renderer=renderer)
+            self.assertEqual((renderer.blocks_rendered, renderer.blocks_reused), (5, 1))
+            with open(os.path.join(output, 'index.html')) as file:
+                self.assertIn('<div><h1 id="home">Home</h1><p>first</p><p>changed</p></div>', file.read())
+
+class TestLiveReload(unittest.TestCase):
+    def test_inject_before_body_end(self):
+        page = inject_live_reload(b'<html><body><p>hi</p></body></html>', 3)
+        self.assertTrue(page.startswith(b'<html><body><p>hi</p><script>'))
+        self.assertIn(b"})('3');", page)
+        self.assertTrue(page.endswith(b'</script>\n</body></html>'))
+
+    def test_wait_for_change(self):
+        live_reload = LiveReload()
+        self.assertEqual(live_reload.wait_for_change(0, timeout=0.01), 0)
+        threading.Timer(0.05, live_reload.bump).start()
+        self.assertEqual(live_reload.wait_for_change(0, timeout=2.0), 1)
+
+    def test_preview_server_injects_script(self):
+        with tempfile.TemporaryDirectory() as directory:
+            write_file(os.path.join(directory, 'index.html'), '<html><body>Hello</body></html>')
+            write_file(os.path.join(directory, 'styles.css'), 'body {}')
+            live_reload = LiveReload()
+            server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(directory, live_reload))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                base = f'http://127.0.0.1:{server.server_address[1]}'
+                with urllib.request.urlopen(base + '/') as response:
+                    self.assertIn(LIVE_RELOAD_PATH.encode(), response.read())
+                with urllib.request.urlopen(base + '/styles.css') as response:
+                    self.assertEqual(response.read(), b'body {}')
+                live_reload.bump()
+                with urllib.request.urlopen(base + LIVE_RELOAD_PATH + '?version=0') as response:
+                    self.assertEqual(response.read(), b'1')
+            finally:
+                server.shutdown()
+                server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,8 @@ class TextType(Enum):
     IMAGE = 'image'
 
 class TextNode:
+    __slots__ = ('text', 'type', 'url')
+
     def __init__(self, text_contents: str, text_type: TextType, this_url: str|None=None):
         self.text = text_contents
         self.type = text_type
@@ -21,8 +23,30 @@ class TextNode:
     
     def __repr__(self) -> str:
         return f'TextNode({self.text}, {self.type.value}, {self.url})'
+
+class TextSpan:
+    # A TextNode that points into the markdown it was parsed from instead of
+    # holding its own copy. The text is only sliced out when it is read.
+    __slots__ = ('source', 'start', 'end', 'type', 'url')
+
+    def __init__(self, source: str, start: int, end: int, text_type: TextType, this_url: str|None=None):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.type = text_type
+        self.url = this_url
+
+    @property
+    def text(self) -> str:
+        return self.source[self.start:self.end]
+
+    def __eq__(self, other) -> bool:
+        return self.text == other.text and self.type == other.type and self.url == other.url
+
+    def __repr__(self) -> str:
+        return f'TextSpan({self.text}, {self.type.value}, {self.url})'
     
-def text_node_to_html_node(text_node) -> htmlnode.LeafNode:
+def text_node_to_html_node(text_node: TextNode|TextSpan) -> htmlnode.LeafNode:
     match text_node.type:
         case TextType.TEXT:
             return htmlnode.LeafNode(tag=None, value=text_node.text)
@@ -101,15 +125,64 @@ def split_nodes_link(old_nodes: list[TextNode]) -> list[TextNode]:
 def split_nodes_image(old_nodes: list[TextNode]) -> list[TextNode]:
     return _split_nodes_for_link_or_image(old_nodes, False)
 
-def text_to_textnodes(markdown: str) -> list[TextNode]:
-    delimiter_dict: dict[str, TextType] = {'**': TextType.BOLD, 
-                                           '_': TextType.ITALIC, 
-                                           '`': TextType.CODE}
-    nodes = [TextNode(markdown, TextType.TEXT)]
-    for delimiter, text_type in delimiter_dict.items():
-        nodes = split_nodes_delimiter(nodes, delimiter, text_type)
-    
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_image(nodes)
+_DELIMITER_PATTERN = re.compile(r'\*\*|[_`]')
+_IMAGE_PATTERN = re.compile(r'!\[(.+?)\]\((.+?)\)')
+_LINK_PATTERN = re.compile(r'(?<!!)\[(.+?)\]\((.+?)\)')
+
+# Delimiters are ranked in the order the old split_nodes_delimiter passes ran.
+# A span opened by a later delimiter cannot contain an earlier one.
+_DELIMITER_TYPES: dict[str, tuple[int, TextType]] = {'**': (0, TextType.BOLD),
+                                                     '_': (1, TextType.ITALIC),
+                                                     '`': (2, TextType.CODE)}
+
+def _make_text_node(source: str, start: int, end: int, text_type: TextType, url: str|None=None) -> TextNode:
+    return TextNode(source[start:end], text_type, url)
+
+def _append_images(nodes: list, make_node, markdown: str, start: int, end: int, text_type: TextType):
+    for match in _IMAGE_PATTERN.finditer(markdown, start, end):
+        if match.start() > start:
+            nodes.append(make_node(markdown, start, match.start(), text_type))
+        nodes.append(make_node(markdown, match.start(1), match.end(1), TextType.IMAGE, match.group(2)))
+        start = match.end()
+    if end > start:
+        nodes.append(make_node(markdown, start, end, text_type))
+
+def _append_segment(nodes: list, make_node, markdown: str, start: int, end: int, text_type: TextType):
+    # Links are found first and images only in the text between them, the
+    # order the old split_nodes_link and split_nodes_image passes ran in.
+    for match in _LINK_PATTERN.finditer(markdown, start, end):
+        _append_images(nodes, make_node, markdown, start, match.start(), text_type)
+        nodes.append(make_node(markdown, match.start(1), match.end(1), TextType.LINK, match.group(2)))
+        start = match.end()
+    _append_images(nodes, make_node, markdown, start, end, text_type)
+
+def _scan_inline(markdown: str, make_node) -> list:
+    nodes: list = list()
+    open_delimiter = None
+    open_rank = 0
+    segment_start = 0
+    for match in _DELIMITER_PATTERN.finditer(markdown):
+        delimiter = match.group()
+        rank, text_type = _DELIMITER_TYPES[delimiter]
+        if open_delimiter == None:
+            _append_segment(nodes, make_node, markdown, segment_start, match.start(), TextType.TEXT)
+            open_delimiter = delimiter
+            open_rank = rank
+            segment_start = match.end()
+        elif delimiter == open_delimiter:
+            _append_segment(nodes, make_node, markdown, segment_start, match.start(), text_type)
+            open_delimiter = None
+            segment_start = match.end()
+        elif rank < open_rank:
+            raise ValueError('Open delimeter is not closed')
+    if open_delimiter != None:
+        raise ValueError('Open delimeter is not closed')
+    _append_segment(nodes, make_node, markdown, segment_start, len(markdown), TextType.TEXT)
 
     return nodes
+
+def text_to_textnodes(markdown: str) -> list[TextNode]:
+    return _scan_inline(markdown, _make_text_node)
+
+def text_to_textspans(markdown: str) -> list[TextSpan]:
+    return _scan_inline(markdown, TextSpan)
@@ -0,0 +1,301 @@
+import ctypes
+import ctypes.util
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import assets
+import build
+from incremental import PageDiffRenderer
+
+POLL_INTERVAL = 0.2
+# Editors often save in several steps (write, rename, chmod). Changes that
+# arrive this close together are handled as one rebuild.
+SETTLE_SECONDS = 0.05
+TEMPLATE_CHECK_INTERVAL = 0.25
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_TIMEOUT = 25.0
+
+LIVE_RELOAD_SCRIPT = '''<script>
+(function poll(version) {
+  fetch('%s?version=' + version)
+    .then(function (response) { return response.text(); })
+    .then(function (current) { if (current !== version) { location.reload(); } else { poll(version); } })
+    .catch(function () { setTimeout(function () { poll(version); }, 1000); });
+})('%%s');
+</script>
+''' % LIVE_RELOAD_PATH
+
+
+def scan_files(roots: list[str]) -> dict[str, tuple[int, int]]:
+    files: dict[str, tuple[int, int]] = {}
+    directories = [root for root in roots if os.path.isdir(root)]
+    while directories:
+        # Files can disappear between listing a directory and reading them.
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            continue
+    return files
+
+class PollingWatcher:
+    # Compares (mtime, size) snapshots of every file under the roots.
+    def __init__(self, roots: list[str], interval: float=POLL_INTERVAL):
+        self.roots = roots
+        self.interval = interval
+        self.files = scan_files(roots)
+
+    def changes(self) -> set[str]:
+        files = scan_files(self.roots)
+        changed = {path for path, signature in files.items() if self.files.get(path) != signature}
+        changed.update(path for path in self.files if path not in files)
+        self.files = files
+        return changed
+
+    def wait(self, timeout: float|None=None) -> set[str]:
+        deadline = None if timeout == None else time.monotonic() + timeout
+        while True:
+            changed = self.changes()
+            if changed or (deadline != None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+INOTIFY_EVENT = struct.Struct('iIII')
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+class InotifyWatcher:
+    # Linux only, through libc. Raises OSError where inotify is unavailable so
+    # callers can fall back to PollingWatcher.
+    def __init__(self, roots: list[str]):
+        self.libc = _load_libc()
+        if self.libc == None:
+            raise OSError('inotify is not available')
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.directories: dict[int, str] = {}
+        for root in roots:
+            if os.path.isdir(root):
+                self._watch_tree(root)
+
+    def _watch_tree(self, root: str) -> set[str]:
+        # Returns the files already inside, which matters for directories
+        # that appear after the watch started.
+        files: set[str] = set()
+        for directory, _, file_names in os.walk(root):
+            descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+            if descriptor >= 0:
+                self.directories[descriptor] = directory
+            files.update(os.path.join(directory, file_name) for file_name in file_names)
+        return files
+
+    def _read_events(self) -> set[str]:
+        changed: set[str] = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, name_length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+            offset += name_length
+            directory = self.directories.get(descriptor)
+            if mask & IN_IGNORED:
+                self.directories.pop(descriptor, None)
+            if directory == None or name == '':
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._watch_tree(path))
+            else:
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: float|None=None) -> set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = self._read_events()
+        while select.select([self.fd], [], [], SETTLE_SECONDS)[0]:
+            changed.update(self._read_events())
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+def make_watcher(roots: list[str], poll: bool=False):
+    if not poll:
+        try:
+            return InotifyWatcher(roots)
+        except OSError:
+            pass
+    return PollingWatcher(roots)
+
+
+class LiveReload:
+    # A version number that browsers long-poll. Every rebuild bumps it.
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def bump(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait_for_change(self, version: int, timeout: float=LIVE_RELOAD_TIMEOUT) -> int:
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+def inject_live_reload(page: bytes, version: int) -> bytes:
+    script = (LIVE_RELOAD_SCRIPT % version).encode()
+    index = page.rfind(b'</body>')
+    if index < 0:
+        return page + script
+    return page[:index] + script + page[index:]
+
+def make_handler(output_dir: str, live_reload: LiveReload):
+    class PreviewHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=output_dir, **kwargs)
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_bytes(self, body: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == LIVE_RELOAD_PATH:
+                try:
+                    version = int(parse_qs(url.query).get('version', ['-1'])[0])
+                except ValueError:
+                    version = -1
+                self.send_bytes(str(live_reload.wait_for_change(version)).encode(), 'text/plain')
+                return
+            if url.path.endswith('/') or url.path.endswith('.html'):
+                path = self.translate_path(url.path)
+                if os.path.isdir(path):
+                    path = os.path.join(path, 'index.html')
+                if os.path.isfile(path):
+                    with open(path, 'rb') as file:
+                        page = file.read()
+                    self.send_bytes(inject_live_reload(page, live_reload.version), 'text/html; charset=utf-8')
+                    return
+            super().do_GET()
+
+    return PreviewHandler
+
+def handle_changes(content_dir: str, static_dir: str|None, output_dir: str, changed: set[str],
+                   cache=None, template_path: str|None=None,
+                   diff_renderer: PageDiffRenderer|None=None) -> build.BuildResult:
+    content_root = os.path.abspath(content_dir)
+    pages: list[str] = []
+    static_paths: list[str] = []
+    for path in sorted(changed):
+        absolute_path = os.path.abspath(path)
+        if absolute_path.startswith(content_root + os.sep) and absolute_path.endswith('.md'):
+            pages.append(os.path.relpath(absolute_path, content_root))
+        elif static_dir != None and absolute_path.startswith(os.path.abspath(static_dir) + os.sep):
+            static_paths.append(path)
+    if static_paths:
+        assets.sync_static(static_dir, output_dir)
+    return build.rebuild_pages(content_dir, output_dir, pages, cache, template_path, diff_renderer)
+
+def template_signature(template_path: str|None) -> tuple[int, int]|None:
+    if template_path == None:
+        return None
+    try:
+        stat = os.stat(template_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def watch(content_dir: str, output_dir: str, static_dir: str|None=None, host: str='127.0.0.1', port: int=8000,
+          jobs: int|None=None, poll: bool=False, template_path: str|None=None):
+    build.build_site(content_dir, output_dir, jobs, template_path=template_path)
+    template_state = template_signature(template_path)
+    if static_dir != None and not os.path.isdir(static_dir):
+        static_dir = None
+    if static_dir != None:
+        assets.sync_static(static_dir, output_dir)
+
+    live_reload = LiveReload()
+    server = ThreadingHTTPServer((host, port), make_handler(output_dir, live_reload))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    watcher = make_watcher([content_dir] + ([static_dir] if static_dir != None else []), poll)
+    cache = build.get_fragment_cache(build.FRAGMENT_CACHE_ENTRIES, None)
+    diff_renderer = PageDiffRenderer(cache)
+    print(f'Serving {output_dir} at http://{host}:{server.server_address[1]}/ ({type(watcher).__name__})')
+    try:
+        while True:
+            changed = watcher.wait(TEMPLATE_CHECK_INTERVAL)
+            # Every page depends on the template, so a new one is a full
+            # rebuild; the manifest sees the new template hash.
+            template_changed = template_signature(template_path) != template_state
+            if not changed and not template_changed:
+                continue
+            start = time.perf_counter()
+            try:
+                if template_changed:
+                    template_state = template_signature(template_path)
+                    result = build.build_site(content_dir, output_dir, jobs, template_path=template_path)
+                else:
+                    result = handle_changes(content_dir, static_dir, output_dir, changed, cache, template_path,
+                                            diff_renderer)
+            except (ValueError, OSError) as error:
+                print(f'error: {error}', file=sys.stderr)
+                continue
+            live_reload.bump()
+            print(f'Rendered {len(result.rendered)} pages, removed {len(result.removed)} '
+                  f'in {(time.perf_counter() - start) * 1e3:.0f} ms')
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        server.shutdown()
+        server.server_close()